@@ -1,10 +1,67 @@
 import streamlit as st
-from config.settings import INDIAN_PORTFOLIO, MOCK_USER_ID, MODEL_NAME, TICKER_TO_NAME
-from services.llm_service import initialize_client
-from ui.tabs.financial_tab import render_financial_tab
-from ui.tabs.valuation_tab import render_valuation_tab
-from ui.tabs.technical_tab import render_technical_tab
-from ui.tabs.news_tab import render_news_tab
+from config.settings import INDIAN_PORTFOLIO, LLM_NEWS_CACHE_TTL, MOCK_USER_ID, MODEL_NAME, PORTFOLIO_LABELS, TICKER_TO_NAME
+from prompts.prompts import get_combined_stock_prompt
+from services.llm_cache import cache_stats
+from services.llm_service import SOURCE_NOTE, extract_structured_data, initialize_client
+from ui.tabs.financial_tab import deep_dive_updates, financial_llm_jobs, render_financial_tab
+from ui.tabs.valuation_tab import render_valuation_tab, valuation_data_jobs
+from ui.tabs.technical_tab import render_technical_tab, technical_data_jobs
+from ui.tabs.news_tab import news_llm_jobs, render_news_tab
+from utils.helpers import run_concurrently, run_llm_jobs
+
+def combined_llm_job(client, ticker):
+    """Single Gemini call covering the deep dive, risk tone and news for a stock."""
+    def job():
+        # The answer includes news, so it ages out on the news TTL
+        data, sources = extract_structured_data(
+            client, get_combined_stock_prompt(ticker), cache_ttl=LLM_NEWS_CACHE_TTL
+        )
+        if not data:
+            return {}
+        reports = {f"{ticker}_tone": data.pop("risk_tone", None), f"{ticker}_news": data.pop("news_guidance", None)}
+        # Only keep the parts the model actually answered; the rest falls back
+        # to the per-report prompts
+        updates = deep_dive_updates(ticker, data, sources) if data.get("narrative") else {}
+        updates.update({key: {"text": text + SOURCE_NOTE, "sources": sources} for key, text in reports.items() if text})
+        return updates
+    return job
+
+def prefetch_llm_analysis(client, ticker):
+    """Fills session_state for the LLM tabs before they render."""
+    llm_keys = [f"{ticker}_data", f"{ticker}_text", f"{ticker}_tone", f"{ticker}_news"]
+    if all(key in st.session_state for key in llm_keys):
+        return
+
+    # Nothing cached yet: one batched prompt instead of a call per report
+    if not any(key in st.session_state for key in llm_keys):
+        run_llm_jobs([combined_llm_job(client, ticker)])
+
+    # Whatever the batched answer missed is fetched per report, concurrently,
+    # so the page waits for the slowest call rather than the sum of them
+    llm_jobs = financial_llm_jobs(client, ticker) + news_llm_jobs(client, ticker)
+    if llm_jobs:
+        run_llm_jobs(llm_jobs)
+
+def prewarm_stock(client, ticker):
+    """Loads every tab's data in one concurrent burst when a new stock is selected.
+
+    The LLM analysis and the Yahoo Finance fetches run side by side, so the
+    tabs then render from session_state and st.cache_data.
+    """
+    if st.session_state.get("prewarmed_ticker") == ticker:
+        # Later reruns for the same stock only top up missing LLM reports
+        with st.spinner("Running LLM analysis..."):
+            prefetch_llm_analysis(client, ticker)
+        return
+
+    with st.status(f"Loading analysis for {ticker}...") as status:
+        run_concurrently(
+            lambda: prefetch_llm_analysis(client, ticker),
+            *valuation_data_jobs(ticker),
+            *technical_data_jobs(ticker),
+        )
+        status.update(label=f"Analysis for {ticker} loaded", state="complete", expanded=False)
+    st.session_state["prewarmed_ticker"] = ticker
 
 def main():
     st.set_page_config(
@@ -19,17 +76,20 @@ def main():
 
     with st.sidebar:
         st.title("📈 StockIQ Fund Manager")
-        selected_ticker = st.selectbox(
+        selected_index = st.selectbox(
             "Choose a Stock to Analyze:",
-            options=INDIAN_PORTFOLIO,
-            format_func=lambda x: f"{TICKER_TO_NAME.get(x, x)} ({x})"
+            options=range(len(INDIAN_PORTFOLIO)),
+            format_func=PORTFOLIO_LABELS.__getitem__
         )
+        selected_ticker = INDIAN_PORTFOLIO[selected_index]
         st.caption(f"LLM Model: `{MODEL_NAME}`")
         st.caption(f"User ID: `{MOCK_USER_ID}`")
 
     stock_name = TICKER_TO_NAME.get(selected_ticker, selected_ticker)
     st.header(f"Intelligence Dashboard for: **{stock_name} ({selected_ticker})**")
 
+    prewarm_stock(client, selected_ticker)
+
     tab1, tab2, tab3, tab4 = st.tabs([
         "📊 Financial Deep Dive (LLM)",
         "💰 Valuation & Quality (YF)",
@@ -49,5 +109,10 @@ def main():
     with tab4:
         render_news_tab(client, selected_ticker)
 
+    with st.sidebar:
+        with st.expander("LLM cache (debug)"):
+            stats = cache_stats()
+            st.caption(f"Hits: {stats['hits']} · Misses: {stats['misses']}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
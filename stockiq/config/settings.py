@@ -1,17 +1,31 @@
+from types import MappingProxyType
+
 from google.genai import types
 
 MODEL_NAME = "gemini-2.5-flash"
 GROUNDING_TOOL = [types.Tool(google_search=types.GoogleSearch())]
 MOCK_USER_ID = "FM_101_INDIA_CUSTOM"
 
-INDIAN_PORTFOLIO = [
+# Seconds to keep Yahoo Finance responses in the Streamlit data cache, by how
+# quickly each kind of data changes
+YF_CACHE_TTL = 3600              # .info fundamentals / valuation
+YF_HISTORY_CACHE_TTL = 24 * 3600  # 5y daily history for technicals
+YF_PRICE_CACHE_TTL = 60          # realtime price
+
+# On-disk cache of successful Gemini responses, shared across sessions
+LLM_CACHE_PATH = ".llm_cache.sqlite3"
+LLM_CACHE_TTL = 24 * 3600
+# News goes stale faster than quarterly financials
+LLM_NEWS_CACHE_TTL = 6 * 3600
+
+INDIAN_PORTFOLIO = (
     "RELIANCE.NS", "JIOFIN.NS", "TIINDIA.NS", "VBL.NS",
     "TATATECH.NS", "TATAMOTORS.NS", "PRAJIND.NS", "ZENTEC.NS",
     "BALKRISIND.NS", "ADANIPORTS.NS", "PGELETRO.NS", "GOKEX.NS",
     "KPITTECH.NS", "MAZDA.BO", "MEDIASSIST.NS", "MAPMYINDIA.NS", "CDSL.NS"
-]
+)
 
-TICKER_TO_NAME = {
+TICKER_TO_NAME = MappingProxyType({
     "RELIANCE.NS": "Reliance Industries", "JIOFIN.NS": "Jio Financial Services",
     "TIINDIA.NS": "Tube Investments India", "VBL.NS": "Varun Beverages",
     "TATATECH.NS": "Tata Technologies", "TATAMOTORS.NS": "Tata Motors",
@@ -20,63 +34,66 @@ TICKER_TO_NAME = {
     "PGELETRO.NS": "PG Electroplasts", "GOKEX.NS": "Gokaldas Exports",
     "KPITTECH.NS": "KPIT Technologies", "MAZDA.BO": "Mazagon Dock Shipbuilders",
     "MEDIASSIST.NS": "Medi Assist", "MAPMYINDIA.NS": "MapmyIndia", "CDSL.NS": "CDSL"
-}
+})
+
+# Sidebar labels, built once instead of formatted per option on every rerun
+PORTFOLIO_LABELS = tuple(f"{TICKER_TO_NAME.get(t, t)} ({t})" for t in INDIAN_PORTFOLIO)
 
 PRIMARY_COLOR = "#00B0FF"
 SECONDARY_COLOR = "#FF9900"
 
-PEER_TICKERS = {
+PEER_TICKERS = MappingProxyType({
     # Conglomerate / Energy
-    "RELIANCE.NS": ["BPCL.NS", "IOC.NS", "ONGC.NS", "TATAPOWER.NS"],
+    "RELIANCE.NS": ("BPCL.NS", "IOC.NS", "ONGC.NS", "TATAPOWER.NS"),
 
     # Financial Services / NBFC
-    "JIOFIN.NS": ["BAJFINANCE.NS", "HDFCBANK.NS", "ICICIBANK.NS", "KOTAKBANK.NS"],
+    "JIOFIN.NS": ("BAJFINANCE.NS", "HDFCBANK.NS", "ICICIBANK.NS", "KOTAKBANK.NS"),
 
     # Capital Goods / Auto Components
-    "TIINDIA.NS": ["CUMMINSIND.NS", "SKFINDIA.NS", "BOSCHLTD.NS", "MOTHERSON.NS"],
+    "TIINDIA.NS": ("CUMMINSIND.NS", "SKFINDIA.NS", "BOSCHLTD.NS", "MOTHERSON.NS"),
 
     # Beverages / FMCG
-    "VBL.NS": ["NESTLEIND.NS", "JUBLFOOD.NS", "BRITANNIA.NS", "UBL.NS"],
+    "VBL.NS": ("NESTLEIND.NS", "JUBLFOOD.NS", "BRITANNIA.NS", "UBL.NS"),
 
     # IT / Engineering Design
-    "TATATECH.NS": ["LTTS.NS", "KPITTECH.NS", "TATAELXSI.NS", "CYIENT.NS"],
+    "TATATECH.NS": ("LTTS.NS", "KPITTECH.NS", "TATAELXSI.NS", "CYIENT.NS"),
 
     # Automobile / EV
-    "TATAMOTORS.NS": ["MARUTI.NS", "M&M.NS", "ASHOKLEY.NS", "BAJAJ-AUTO.NS"],
+    "TATAMOTORS.NS": ("MARUTI.NS", "M&M.NS", "ASHOKLEY.NS", "BAJAJ-AUTO.NS"),
 
     # Process Engineering / Bioenergy
-    "PRAJIND.NS": ["CUMMINSIND.NS", "BEML.NS", "THERMAX.NS", "ELECON.NS"],
+    "PRAJIND.NS": ("CUMMINSIND.NS", "BEML.NS", "THERMAX.NS", "ELECON.NS"),
 
     # Defence / Electronics
-    "ZENTEC.NS": ["BEL.NS", "HAL.NS", "SOLARINDS.NS", "DATA-PATTERN.NS"],
+    "ZENTEC.NS": ("BEL.NS", "HAL.NS", "SOLARINDS.NS", "DATA-PATTERN.NS"),
 
     # Tyres / Auto Ancillary
-    "BALKRISIND.NS": ["MRF.NS", "APOLLOTYRE.NS", "JKTYRE.NS", "CEATLTD.NS"],
+    "BALKRISIND.NS": ("MRF.NS", "APOLLOTYRE.NS", "JKTYRE.NS", "CEATLTD.NS"),
 
     # Ports / Infrastructure
-    "ADANIPORTS.NS": ["CONCOR.NS", "GMDCLTD.NS", "GMRINFRA.NS", "NHPC.NS"],
+    "ADANIPORTS.NS": ("CONCOR.NS", "GMDCLTD.NS", "GMRINFRA.NS", "NHPC.NS"),
 
     # Electronics Manufacturing / EMS
-    "PGELETRO.NS": ["DIXON.NS", "AMBER.NS", "ELIN.NS", "SYRMA.NS"],
+    "PGELETRO.NS": ("DIXON.NS", "AMBER.NS", "ELIN.NS", "SYRMA.NS"),
 
     # Textile / Export
-    "GOKEX.NS": ["KPRMILL.NS", "PAGEIND.NS", "WELSPUNIND.NS", "VARDMNPOLY.NS"],
+    "GOKEX.NS": ("KPRMILL.NS", "PAGEIND.NS", "WELSPUNIND.NS", "VARDMNPOLY.NS"),
 
     # Auto Tech / Engineering IT
-    "KPITTECH.NS": ["TATAELXSI.NS", "LTTS.NS", "CYIENT.NS", "PERSISTENT.NS"],
+    "KPITTECH.NS": ("TATAELXSI.NS", "LTTS.NS", "CYIENT.NS", "PERSISTENT.NS"),
 
     # Shipbuilding / Defense PSU
-    "MAZDA.BO": ["COCHINSHIP.NS", "GRSE.NS", "GARDENSILK.NS"],
+    "MAZDA.BO": ("COCHINSHIP.NS", "GRSE.NS", "GARDENSILK.NS"),
 
     # Healthcare / Insurance Tech
-    "MEDIASSIST.NS": ["HDFCLIFE.NS", "ICICIPRULI.NS", "STARHEALTH.NS", "MAXHEALTH.NS"],
+    "MEDIASSIST.NS": ("HDFCLIFE.NS", "ICICIPRULI.NS", "STARHEALTH.NS", "MAXHEALTH.NS"),
 
     # Mapping / Tech SaaS
-    "MAPMYINDIA.NS": ["INFOEDGE.NS", "ZOMATO.NS", "NAUKRI.NS", "PAYTM.NS"],
+    "MAPMYINDIA.NS": ("INFOEDGE.NS", "ZOMATO.NS", "NAUKRI.NS", "PAYTM.NS"),
 
     # Depository / Financial Infrastructure
-    "CDSL.NS": ["ICICIBANK.NS", "HDFCBANK.NS", "KOTAKBANK.NS", "SBICARD.NS"],
+    "CDSL.NS": ("ICICIBANK.NS", "HDFCBANK.NS", "KOTAKBANK.NS", "SBICARD.NS"),
 
     # Default fallback
-    "DEFAULT": ["NIFTYBEES.NS"]
-}
+    "DEFAULT": ("NIFTYBEES.NS",)
+})
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, Optional
+
+from config.settings import LLM_CACHE_PATH, LLM_CACHE_TTL
+
+# Process-wide hit/miss counters, shown in the sidebar debug expander
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+def _cache_key(kind: str, prompt: str, model: str, temperature: float) -> str:
+    """Stable key for everything that determines a response."""
+    payload = json.dumps(
+        {"kind": kind, "model": model, "prompt": prompt, "temperature": temperature},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(LLM_CACHE_PATH, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS llm_cache ("
+        "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    return conn
+
+def _record(outcome: str) -> None:
+    with _stats_lock:
+        _stats[outcome] += 1
+
+def cache_stats() -> Dict[str, int]:
+    """Returns a snapshot of the hit/miss counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+def get_cached_response(
+    kind: str,
+    prompt: str,
+    model: str,
+    temperature: float,
+    ttl: int = LLM_CACHE_TTL,
+) -> Optional[Any]:
+    """Returns the stored response for this prompt if it is younger than `ttl` seconds."""
+    try:
+        with closing(_connect()) as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?",
+                (_cache_key(kind, prompt, model, temperature),),
+            ).fetchone()
+    except sqlite3.Error as e:
+        print(f"LLM cache read failed: {e}")
+        row = None
+
+    if row is None or time.time() - row[1] > ttl:
+        _record("misses")
+        return None
+    _record("hits")
+    return json.loads(row[0])
+
+def store_response(kind: str, prompt: str, model: str, temperature: float, value: Any) -> None:
+    """Persists a successful response so later sessions can reuse it."""
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (_cache_key(kind, prompt, model, temperature), json.dumps(value), time.time()),
+            )
+    except sqlite3.Error as e:
+        print(f"LLM cache write failed: {e}")
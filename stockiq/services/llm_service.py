@@ -2,13 +2,25 @@ import streamlit as st
 import time
 import json
 import os
+import httpx
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
 from google.genai.errors import APIError
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Iterator
 
-from config.settings import MODEL_NAME, GROUNDING_TOOL
+from config.settings import MODEL_NAME, GROUNDING_TOOL, LLM_CACHE_TTL
+from services.llm_cache import get_cached_response, store_response
+from utils.helpers import backoff_delay
+
+TEXT_TEMPERATURE = 0.2
+JSON_TEMPERATURE = 0.01
+
+SOURCE_NOTE = f"\n\n---\n*Data Grounded via Google Search. Model: {MODEL_NAME}*"
+
+def _is_transient(error: APIError) -> bool:
+    """Rate limits (429) and server-side (5xx) errors are worth retrying; other client errors are not."""
+    return error.code == 429 or (error.code or 0) >= 500
 
 @st.cache_resource(show_spinner=False)
 def initialize_client() -> Optional[genai.Client]:
@@ -20,8 +32,18 @@ def initialize_client() -> Optional[genai.Client]:
         if not GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY not found in environment variables. Please set it in your .env file.")
         
-        # Initialize the native Google GenAI client
-        client = genai.Client(api_key=GEMINI_API_KEY)
+        # Initialize the native Google GenAI client. The client (and its httpx
+        # pool) lives in st.cache_resource; keep idle connections open for a
+        # minute instead of httpx's 5s default so calls on the next rerun skip
+        # a fresh TCP+TLS handshake, and size the pool for concurrent calls.
+        pool_limits = httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60)
+        client = genai.Client(
+            api_key=GEMINI_API_KEY,
+            http_options=types.HttpOptions(
+                client_args={"limits": pool_limits},
+                async_client_args={"limits": pool_limits},
+            ),
+        )
         return client
     except Exception as e:
         st.error(f"Error initializing Gemini client: {e}")
@@ -30,31 +52,33 @@ def initialize_client() -> Optional[genai.Client]:
 
 def _extract_sources(response: types.GenerateContentResponse) -> List[str]:
     """Helper function to extract unique source URLs from the grounding metadata (robustly)."""
-    sources = set()
-    
-    if (response.candidates and 
-        response.candidates[0].grounding_metadata):
-        
-        grounding = response.candidates[0].grounding_metadata
-        
-        # Check if grounding_chunks is NOT None before iterating
-        if grounding.grounding_chunks is not None:
-            for chunk in grounding.grounding_chunks:
-                # Use hasattr for safety, though standard in the SDK
-                if hasattr(chunk, 'web') and chunk.web and hasattr(chunk.web, 'uri') and chunk.web.uri:
-                    sources.add(chunk.web.uri)
+    if not response.candidates:
+        return []
 
-    return sorted(list(sources))
+    # Any level of the grounding metadata may be missing or None
+    grounding = getattr(response.candidates[0], 'grounding_metadata', None)
+    chunks = getattr(grounding, 'grounding_chunks', None) or []
+    return sorted({chunk.web.uri for chunk in chunks if getattr(chunk, 'web', None) and chunk.web.uri})
 
 def generate_llm_response(
     client: genai.Client,
     prompt: str,
     max_retries: int = 3,
+    refresh: bool = False,
+    cache_ttl: int = LLM_CACHE_TTL,
 ) -> Tuple[str, List[str]]:
-    """Calls Gemini API, returns the text content and a list of source URLs."""
+    """Calls Gemini API, returns the text content and a list of source URLs.
+
+    Responses younger than `cache_ttl` seconds are reused from the on-disk
+    cache unless `refresh` is set.
+    """
     if client is None:
         return ("LLM Client failed to initialize. Check API key.", [])
 
+    cached = None if refresh else get_cached_response("text", prompt, MODEL_NAME, TEXT_TEMPERATURE, cache_ttl)
+    if cached is not None:
+        return cached[0], cached[1]
+
     try:
         for attempt in range(max_retries):
             # ... (API call logic remains the same) ...
@@ -64,19 +88,22 @@ def generate_llm_response(
                     contents=prompt,
                     config=types.GenerateContentConfig(
                         tools=GROUNDING_TOOL,
-                        temperature=0.2, 
+                        temperature=TEXT_TEMPERATURE,
                     ),
                 )
                 
                 sources = _extract_sources(response)
-                source_note = f"\n\n---\n*Data Grounded via Google Search. Model: {MODEL_NAME}*"
-                return response.text + source_note, sources # SUCCESS RETURN
+                text = response.text + SOURCE_NOTE
+                store_response("text", prompt, MODEL_NAME, TEXT_TEMPERATURE, [text, sources])
+                return text, sources # SUCCESS RETURN
 
             except APIError as e:
-                # ... (API error handling remains the same) ...
-                if attempt < max_retries - 1:
+                if _is_transient(e) and attempt < max_retries - 1:
                     st.warning(f"API call failed (Attempt {attempt + 1}/{max_retries}). Retrying with backoff...")
-                    time.sleep(2 ** attempt) 
+                    time.sleep(backoff_delay(attempt))
+                elif not _is_transient(e):
+                    st.error(f"LLM API rejected the request: {e}")
+                    return ("Analysis could not be generated due to an API error.", [])
                 else:
                     st.error(f"LLM API failed after {max_retries} attempts: {e}")
                     return ("Analysis could not be generated due to a persistent API error.", [])
@@ -94,15 +121,62 @@ def generate_llm_response(
         return ("Analysis failed due to a critical setup error.", [])
 
 
+def _parse_json_object(text: str) -> Dict[str, Any]:
+    """Parses the outermost {...} in a model answer, ignoring fences or prose around it."""
+    # response_mime_type="application/json" cannot be combined with the Google
+    # Search tool, so the model may still wrap the object in ```json fences
+    start, end = text.find("{"), text.rfind("}")
+    return json.loads(text[start:end + 1])
+
+def stream_llm_response(client: genai.Client, prompt: str, sources: List[str]) -> Iterator[str]:
+    """Yields the Gemini answer chunk by chunk, for st.write_stream.
+
+    Source URLs are collected into `sources` as grounding metadata arrives,
+    and the finished answer is stored in the response cache. A stream cannot
+    be retried once text has been shown, so errors end it with a message.
+    """
+    parts = []
+    try:
+        for chunk in client.models.generate_content_stream(
+            model=MODEL_NAME,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                tools=GROUNDING_TOOL,
+                temperature=TEXT_TEMPERATURE,
+            ),
+        ):
+            sources.extend(uri for uri in _extract_sources(chunk) if uri not in sources)
+            if chunk.text:
+                parts.append(chunk.text)
+                yield chunk.text
+    except APIError as e:
+        st.error(f"LLM API failed while streaming: {e}")
+        yield "\n\nAnalysis could not be completed due to an API error."
+        return
+
+    yield SOURCE_NOTE
+    sources.sort()
+    store_response("text", prompt, MODEL_NAME, TEXT_TEMPERATURE, ["".join(parts) + SOURCE_NOTE, sources])
+
 def extract_structured_data(
     client: genai.Client,
     prompt: str,
     max_retries: int = 3,
+    refresh: bool = False,
+    cache_ttl: int = LLM_CACHE_TTL,
 ) -> Tuple[Optional[Dict[str, Any]], List[str]]:
-    """Calls Gemini API to extract data, returns parsed JSON dictionary and source URLs."""
+    """Calls Gemini API to extract data, returns parsed JSON dictionary and source URLs.
+
+    Responses younger than `cache_ttl` seconds are reused from the on-disk
+    cache unless `refresh` is set.
+    """
     if client is None:
         return (None, [])
 
+    cached = None if refresh else get_cached_response("json", prompt, MODEL_NAME, JSON_TEMPERATURE, cache_ttl)
+    if cached is not None:
+        return cached[0], cached[1]
+
     try:
         for attempt in range(max_retries):
             # ... (API call and JSON parsing logic remains the same, ensuring robustness) ...
@@ -112,28 +186,26 @@ def extract_structured_data(
                     contents=prompt,
                     config=types.GenerateContentConfig(
                         tools=GROUNDING_TOOL,
-                        temperature=0.01,
+                        temperature=JSON_TEMPERATURE,
                     ),
                 )
                 
                 sources = _extract_sources(response)
                 
-                raw_json_text = response.text.strip()
-                if raw_json_text.startswith("```json"):
-                    raw_json_text = raw_json_text[7:]
-                if raw_json_text.endswith("```"):
-                    raw_json_text = raw_json_text[:-3]
-
-                data = json.loads(raw_json_text.strip())
+                data = _parse_json_object(response.text or "")
+                store_response("json", prompt, MODEL_NAME, JSON_TEMPERATURE, [data, sources])
                 return data, sources # SUCCESS RETURN
 
             except json.JSONDecodeError as e:
                 st.warning(f"Failed to parse JSON (Attempt {attempt + 1}/{max_retries}). LLM output was non-compliant.")
-                time.sleep(1 ** attempt)
+                time.sleep(backoff_delay(attempt))
             except APIError as e:
-                if attempt < max_retries - 1:
+                if _is_transient(e) and attempt < max_retries - 1:
                     st.warning(f"API call failed (Attempt {attempt + 1}/{max_retries}). Retrying with backoff...")
-                    time.sleep(2 ** attempt)
+                    time.sleep(backoff_delay(attempt))
+                elif not _is_transient(e):
+                    st.error(f"LLM API rejected the request: {e}")
+                    return (None, [])
                 else:
                     st.error(f"LLM API failed after {max_retries} attempts: {e}")
                     return (None, [])
@@ -1,9 +1,13 @@
+import streamlit as st
 import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional, Sequence
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import YF_CACHE_TTL, YF_HISTORY_CACHE_TTL, YF_PRICE_CACHE_TTL
 
 # Suppress yfinance warnings about data retrieval issues
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -16,26 +20,66 @@ def get_ticker_object(ticker_symbol: str) -> Optional[yf.Ticker]:
         print(f"Error creating Ticker object for {ticker_symbol}: {e}")
         return None
 
+@st.cache_data(ttl=YF_CACHE_TTL, show_spinner=False)
+def get_ticker_info(ticker_symbol: str) -> Dict[str, Any]:
+    """Fetches a ticker's .info once per TTL for every function that reads it."""
+    ticker = get_ticker_object(ticker_symbol)
+    return ticker.info if ticker else {}
+
+@st.cache_data(ttl=YF_CACHE_TTL, show_spinner=False)
+def _fetch_peer_metrics(peer_ticker: str) -> Dict[str, Any]:
+    """Fetches the valuation multiples for a single peer ticker."""
+    # Cached per symbol so a peer shared by several portfolio stocks is only
+    # fetched once per TTL
+    try:
+        peer_info = get_ticker_info(peer_ticker)
+        return {
+            'Stock': peer_ticker,
+            'P/E (TTM)': peer_info.get('trailingPE', np.nan),
+            'P/B': peer_info.get('priceToBook', np.nan),
+            'EV/EBITDA': peer_info.get('enterpriseToEbitda', np.nan),
+        }
+    except:
+        return {'Stock': peer_ticker, 'P/E (TTM)': np.nan, 'P/B': np.nan, 'EV/EBITDA': np.nan}
+
+@st.cache_data(ttl=YF_PRICE_CACHE_TTL, show_spinner=False)
 def get_realtime_price(ticker_symbol: str) -> float:
     """Fetches the current market price."""
+    # fast_info reads the price off the chart endpoint, one light request
+    # instead of the multi-module .info scrape
     ticker = get_ticker_object(ticker_symbol)
-    if ticker and ticker.info.get('currentPrice'):
-        return ticker.info['currentPrice']
+    try:
+        current_price = ticker.fast_info['lastPrice'] if ticker else None
+    except:
+        current_price = None
+    if current_price:
+        return float(current_price)
     
     # Fallback: Get last close price from history
     try:
         data = yf.download(ticker_symbol, period="1d", interval="1m", progress=False)
-        return data['Close'].iloc[-1] if not data.empty else 0.0
+        # 'Close' is a one-column frame under yfinance's (Price, Ticker) columns;
+        # read the last value straight off the array as a plain float
+        return float(data['Close'].to_numpy().ravel()[-1]) if not data.empty else 0.0
     except:
         return 0.0
 
+def _dcf_kernel(eps: float, growth_rate: float, discount_rate: float,
+                terminal_multiple: float, years: int = 5) -> float:
+    """Present value of `years` of projected EPS plus a terminal multiple on the final year."""
+    # Year-i EPS discounted to today is eps * ((1 + g) / (1 + r))**i, so one
+    # power vector covers both the projection and the discounting
+    factors = ((1 + growth_rate) / (1 + discount_rate)) ** np.arange(1, years + 1)
+    
+    # Terminal Value (final-year EPS * Terminal Multiple), discounted by the same factor
+    return float(eps * (factors.sum() + factors[-1] * terminal_multiple))
+
+@st.cache_data(ttl=YF_CACHE_TTL, show_spinner=False)
 def calculate_dcf(ticker_symbol: str) -> Dict[str, Any]:
     """Uses yfinance to pull info for a simplified DCF calculation."""
-    ticker = get_ticker_object(ticker_symbol)
-    if not ticker:
+    info = get_ticker_info(ticker_symbol)
+    if not info:
         return {'current_price': 0, 'intrinsic_value': 0, 'margin_of_safety': 0, 'inputs': {}}
-
-    info = ticker.info
     
     # --- Real Data Points ---
     current_price = info.get('currentPrice', 0.0)
@@ -51,17 +95,7 @@ def calculate_dcf(ticker_symbol: str) -> Dict[str, Any]:
     if eps_ttm <= 0 or current_price == 0:
         return {'current_price': current_price, 'intrinsic_value': 0, 'margin_of_safety': 0, 'inputs': {}}
 
-    # Simplified 5-year DCF projection (using EPS for proxy)
-    projected_eps = [eps_ttm * (1 + growth_rate)**i for i in range(1, 6)]
-    
-    # Calculate Present Value (PV)
-    pv_cash_flows = [eps / (1 + discount_rate)**i for i, eps in enumerate(projected_eps, 1)]
-    
-    # Terminal Value (Year 5 EPS * Terminal Multiple)
-    terminal_value = projected_eps[-1] * terminal_multiple
-    pv_terminal_value = terminal_value / (1 + discount_rate)**5
-    
-    intrinsic_value = round(sum(pv_cash_flows) + pv_terminal_value, 2)
+    intrinsic_value = round(_dcf_kernel(eps_ttm, growth_rate, discount_rate, terminal_multiple), 2)
     
     margin_of_safety = round(100 * (intrinsic_value - current_price) / intrinsic_value, 2)
     
@@ -76,6 +110,25 @@ def calculate_dcf(ticker_symbol: str) -> Dict[str, Any]:
         }
     }
 
+# The indicator kernels work along the last axis, so a (tickers x days) price
+# matrix is processed in one call as well as a single close series.
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing simple moving average, NaN-padded to the input length."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=-1)
+        out[..., window - 1:] = windows.mean(axis=-1)
+    return out
+
+def _wilder_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Wilder's smoothed average, NaN until `window` values have been seen."""
+    # pandas smooths down columns, so lay each series out as one column
+    columns = pd.DataFrame(values.reshape(-1, values.shape[-1]).T)
+    smoothed = columns.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    return smoothed.to_numpy().T.reshape(values.shape)
+
+@st.cache_data(ttl=YF_HISTORY_CACHE_TTL, show_spinner=False)
 def get_technical_data(ticker_symbol: str) -> pd.DataFrame:
     """Fetches 12 months of historical price data and calculates SMAs and RSI (using TA-Lib or simplified)."""
     #end_date = datetime.today()
@@ -102,32 +155,44 @@ def get_technical_data(ticker_symbol: str) -> pd.DataFrame:
     if 'Adj Close' in df_multi.columns:
         df_multi = df_multi.rename(columns={'Adj Close': 'Close'})
 
-    # The resulting DataFrame now has a single-level index showing only price metrics
-    df = df_multi
+    # Calculate SMAs on the raw close array; averaging a sliding-window view
+    # avoids pandas' per-window dispatch
+    close = df_multi['Close'].to_numpy(dtype=float)
+    sma_50 = np.round(_rolling_mean(close, 50), 2)
+    sma_200 = np.round(_rolling_mean(close, 200), 2)
+    
+    # 14-day RSI with Wilder's smoothing (an EWM with alpha=1/14), one pass
+    # over each of the gain/loss arrays
+    delta = np.diff(close, prepend=close[0])
+    gain = _wilder_mean(np.where(delta > 0, delta, 0.0), 14)
+    loss = _wilder_mean(np.where(delta < 0, -delta, 0.0), 14)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+    rsi = 100 - np.round(100 / (1 + rs), 2)
 
-    # Calculate SMAs
-    df['SMA_50'] = df['Close'].rolling(window=50).mean().round(2)
-    df['SMA_200'] = df['Close'].rolling(window=200).mean().round(2)
-    
-    # Simplified RSI (Note: A true RSI needs >14 periods of history)
-    # This is a placeholder; for production, use 'ta' library.
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs)).round(2)
-    
     # Drop rows where SMAs/RSI are NaN due to insufficient history (start of the DataFrame)
-    df = df.dropna(subset=['SMA_50', 'SMA_200', 'RSI'])
-    return df
+    valid = ~(np.isnan(sma_50) | np.isnan(sma_200) | np.isnan(rsi))
 
-def get_valuation_and_peer_data(ticker_symbol: str, peer_tickers: List[str]) -> Dict[str, Any]:
+    # Build the result once from 1-D column arrays (each column stays
+    # contiguous) instead of assigning into the download frame and copying it
+    # again in dropna
+    columns = {col: df_multi[col].to_numpy()[valid] for col in df_multi.columns}
+    columns.update({'Close': close[valid], 'SMA_50': sma_50[valid], 'SMA_200': sma_200[valid], 'RSI': rsi[valid]})
+    return pd.DataFrame(columns, index=df_multi.index[valid])
+
+@st.cache_data(ttl=YF_CACHE_TTL, show_spinner=False)
+def get_valuation_and_peer_data(ticker_symbol: str, peer_tickers: Sequence[str]) -> Dict[str, Any]:
     """Fetches valuation metrics for the company and its peers."""
-    ticker = get_ticker_object(ticker_symbol)
-    if not ticker:
+    # Yahoo still serves .info one symbol per request, so fetch the company
+    # and all peers on a thread pool instead of one after another.
+    with ThreadPoolExecutor(max_workers=min(16, len(peer_tickers) + 1)) as executor:
+        info_future = executor.submit(get_ticker_info, ticker_symbol)
+        peer_futures = [executor.submit(_fetch_peer_metrics, peer) for peer in peer_tickers]
+        info = info_future.result()
+        # --- Peer Valuation (for comparison chart) ---
+        peer_metrics = [future.result() for future in peer_futures]
+    if not info:
         return {}
-
-    info = ticker.info
     
     # --- Company Valuation ---
     company_data = {
@@ -136,24 +201,6 @@ def get_valuation_and_peer_data(ticker_symbol: str, peer_tickers: List[str]) ->
         'EV/EBITDA': info.get('enterpriseToEbitda', np.nan),
         '5Y Avg P/E': info.get('fiftyDayAverage', np.nan) / info.get('trailingEps', 1) # Crude proxy, not actual 5Y avg
     }
-    
-    # --- Peer Valuation (for comparison chart) ---
-    peer_metrics = []
-    
-    # Bulk fetch peer info
-    #multi_ticker_data = yf.download(peer_tickers, period="1d", progress=False)
-    
-    for peer_ticker in peer_tickers:
-        try:
-            peer_info = yf.Ticker(peer_ticker).info
-            peer_metrics.append({
-                'Stock': peer_ticker,
-                'P/E (TTM)': peer_info.get('trailingPE', np.nan),
-                'P/B': peer_info.get('priceToBook', np.nan),
-                'EV/EBITDA': peer_info.get('enterpriseToEbitda', np.nan),
-            })
-        except:
-            peer_metrics.append({'Stock': peer_ticker, 'P/E (TTM)': np.nan, 'P/B': np.nan, 'EV/EBITDA': np.nan})
 
     # --- Financial Quality Ratios ---
     quality_ratios = {
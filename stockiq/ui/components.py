@@ -1,5 +1,5 @@
+import numpy as np
 import streamlit as st
-import altair as alt
 
 def display_sources(sources):
     if not sources:
@@ -9,6 +9,6 @@ def display_sources(sources):
         for i, url in enumerate(sources, 1):
             st.markdown(f"{i}. [{url}]({url})")
 
-def colorize_change(val):
-    color = "green" if val > 0 else "red"
-    return f'<span style="color:{color};font-weight:bold;">{val:.2f}%</span>'
\ No newline at end of file
+def colorize_change(values):
+    """Styler.apply function: bold green for gains, red otherwise, for a whole column in one pass."""
+    return np.where(values.to_numpy() > 0, "color: green; font-weight: bold", "color: red; font-weight: bold")
\ No newline at end of file
@@ -1,46 +1,90 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
-from prompts.prompts import get_data_extraction_prompt, get_financial_deep_dive_prompt
-from services.llm_service import extract_structured_data, generate_llm_response
-from ui.components import display_sources
-from config.settings import PRIMARY_COLOR, SECONDARY_COLOR
+from prompts.prompts import get_deep_dive_prompt
+from services.llm_service import SOURCE_NOTE, extract_structured_data
+from ui.components import colorize_change, display_sources
+from utils.helpers import run_llm_jobs
+from config.settings import LLM_CACHE_TTL, PRIMARY_COLOR, SECONDARY_COLOR
 
+def financial_llm_jobs(client, stock_name, refresh=False):
+    """Gemini jobs still needed to render this tab (see utils.helpers.run_llm_jobs)."""
+    data_key, text_key = f"{stock_name}_data", f"{stock_name}_text"
+    if data_key in st.session_state and text_key in st.session_state:
+        return []
+
+    # One grounded call returns both the chart data and the written analysis,
+    # so the search retrieval and prompt tokens are paid for once.
+    def deep_dive():
+        data, sources = extract_structured_data(
+            client, get_deep_dive_prompt(stock_name), refresh=refresh
+        )
+        return deep_dive_updates(stock_name, data, sources)
+
+    return [deep_dive]
+
+def deep_dive_updates(stock_name, data, sources):
+    """session_state entries for this tab from a deep dive JSON response."""
+    narrative = data.pop("narrative", None) if data else None
+    text = narrative + SOURCE_NOTE if narrative else "Analysis could not be generated."
+    return {
+        f"{stock_name}_data": {"data": data, "sources": sources},
+        f"{stock_name}_text": {"text": text, "sources": sources},
+    }
+
+# A fragment, so the refresh button reruns only this tab rather than the
+# whole page (and every other tab's rendering)
+@st.fragment
 def render_financial_tab(client, stock_name):
     st.subheader("Quarterly Performance and Ownership")
 
-    if st.button(f"Generate/Refresh Deep Dive for {stock_name}"):
+    refresh = st.button(f"Generate/Refresh Deep Dive for {stock_name}")
+    if refresh:
         st.session_state.pop(f"{stock_name}_data", None)
         st.session_state.pop(f"{stock_name}_text", None)
 
     data_key, text_key = f"{stock_name}_data", f"{stock_name}_text"
 
-    if data_key not in st.session_state:
-        with st.spinner("Extracting structured data..."):
-            data, sources = extract_structured_data(client, get_data_extraction_prompt(stock_name))
-            st.session_state[data_key] = {"data": data, "sources": sources}
+    jobs = financial_llm_jobs(client, stock_name, refresh=refresh)
+    if jobs:
+        with st.spinner("Extracting financials and generating written analysis..."):
+            run_llm_jobs(jobs)
 
     cache = st.session_state.get(data_key)
     if cache and cache["data"]:
         show_financial_charts(cache["data"])
-        display_sources(cache["sources"])
-
-    if text_key not in st.session_state:
-        with st.spinner("Generating written analysis..."):
-            text, sources = generate_llm_response(client, get_financial_deep_dive_prompt(stock_name))
-            st.session_state[text_key] = {"text": text, "sources": sources}
 
     text_cache = st.session_state.get(text_key)
     if text_cache:
         st.markdown(text_cache["text"])
         display_sources(text_cache["sources"])
 
-def show_financial_charts(data):
-    df = pd.DataFrame(data["financial_data"])
-    df_m = df.melt(id_vars="metric", var_name="Quarter", value_name="Value")
-    chart = alt.Chart(df_m).mark_bar().encode(
+@st.cache_data(ttl=LLM_CACHE_TTL, show_spinner=False)
+def _financial_chart_spec(df_m):
+    """Builds the QoQ bar chart once per dataset and returns its Vega-Lite spec."""
+    import altair as alt  # deferred: only needed once there is data to chart
+
+    return alt.Chart(df_m).mark_bar().encode(
         x="metric:N", y="Value:Q",
         color=alt.Color("Quarter:N", scale=alt.Scale(range=[PRIMARY_COLOR, SECONDARY_COLOR])),
         tooltip=["metric", "Quarter", "Value"]
+    ).to_dict()
+
+def show_financial_charts(data):
+    df = pd.DataFrame(data["financial_data"])
+    df_m = df.melt(id_vars="metric", var_name="Quarter", value_name="Value")
+    st.vega_lite_chart(_financial_chart_spec(df_m), use_container_width=True)
+
+    show_shareholding_table(data)
+
+def show_shareholding_table(data):
+    df = pd.DataFrame(data.get("shareholding_data", []))
+    if df.empty:
+        return
+    df["change_qoq"] = pd.to_numeric(df["change_qoq"], errors="coerce")
+    df = df.rename(columns={"category": "Category", "percentage": "Holding (%)", "change_qoq": "QoQ Change (pp)"})
+    # Styler goes through Streamlit's Arrow path instead of an HTML string
+    # that st.markdown has to re-sanitize on every rerun
+    styled = df.style.apply(colorize_change, subset=["QoQ Change (pp)"]).format(
+        "{:.2f}%", subset=["QoQ Change (pp)"]
     )
-    st.altair_chart(chart, use_container_width=True)
+    st.dataframe(styled, hide_index=True)
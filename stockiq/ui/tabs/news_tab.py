@@ -1,35 +1,52 @@
 import streamlit as st
 from prompts.prompts import get_risk_tone_prompt, get_news_guidance_prompt
-from services.llm_service import generate_llm_response
+from services.llm_service import generate_llm_response, stream_llm_response
 from ui.components import display_sources
+from config.settings import LLM_NEWS_CACHE_TTL
+from utils.helpers import run_llm_jobs
 
-def render_news_tab(client, stock_name):
-    st.subheader("Management Tone & Real-Time News")
+def news_llm_jobs(client, stock_name, refresh=False):
+    """Gemini jobs still needed to render this tab (see utils.helpers.run_llm_jobs)."""
+    tone_key, news_key = f"{stock_name}_tone", f"{stock_name}_news"
 
-    if st.button(f"Generate/Refresh Insights for {stock_name}"):
-        st.session_state.pop(f"{stock_name}_tone", None)
-        st.session_state.pop(f"{stock_name}_news", None)
+    def tone():
+        text, src = generate_llm_response(client, get_risk_tone_prompt(stock_name), refresh=refresh)
+        return {tone_key: {"text": text, "sources": src}}
 
-    tone_key, news_key = f"{stock_name}_tone", f"{stock_name}_news"
+    def news():
+        text, src = generate_llm_response(
+            client, get_news_guidance_prompt(stock_name), refresh=refresh, cache_ttl=LLM_NEWS_CACHE_TTL
+        )
+        return {news_key: {"text": text, "sources": src}}
 
-    if tone_key not in st.session_state:
-        with st.spinner("Analyzing management tone and risk..."):
-            text, src = generate_llm_response(client, get_risk_tone_prompt(stock_name))
-            st.session_state[tone_key] = {"text": text, "sources": src}
+    return [job for key, job in ((tone_key, tone), (news_key, news)) if key not in st.session_state]
 
-    tone_cache = st.session_state.get(tone_key)
-    if tone_cache:
-        st.markdown(tone_cache["text"])
-        display_sources(tone_cache["sources"])
+@st.fragment  # refresh reruns this tab only (see render_financial_tab)
+def render_news_tab(client, stock_name):
+    st.subheader("Management Tone & Real-Time News")
 
-    st.markdown("---")
+    refresh = st.button(f"Generate/Refresh Insights for {stock_name}")
 
-    if news_key not in st.session_state:
-        with st.spinner("Fetching latest news and guidance..."):
-            text, src = generate_llm_response(client, get_news_guidance_prompt(stock_name))
-            st.session_state[news_key] = {"text": text, "sources": src}
+    tone_key, news_key = f"{stock_name}_tone", f"{stock_name}_news"
 
-    news_cache = st.session_state.get(news_key)
-    if news_cache:
-        st.markdown(news_cache["text"])
-        display_sources(news_cache["sources"])
+    if not refresh:
+        # Tone/risk and news are independent Gemini calls; run them side by side.
+        jobs = news_llm_jobs(client, stock_name)
+        if jobs:
+            with st.spinner("Analyzing management tone and fetching latest news..."):
+                run_llm_jobs(jobs)
+
+    reports = ((tone_key, get_risk_tone_prompt(stock_name)), (news_key, get_news_guidance_prompt(stock_name)))
+    for i, (key, prompt) in enumerate(reports):
+        if i:
+            st.markdown("---")
+        if refresh:
+            # A regenerated report is streamed so its text appears as it is written
+            sources = []
+            text = st.write_stream(stream_llm_response(client, prompt, sources))
+            st.session_state[key] = {"text": text, "sources": sources}
+        report = st.session_state.get(key)
+        if report:
+            if not refresh:
+                st.markdown(report["text"])
+            display_sources(report["sources"])
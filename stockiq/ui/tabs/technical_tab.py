@@ -1,9 +1,28 @@
 import streamlit as st
-import altair as alt
-from services.yfinance_service import get_technical_data
-from config.settings import TICKER_TO_NAME, PRIMARY_COLOR, SECONDARY_COLOR
+from utils.helpers import downsample_for_chart
+from config.settings import TICKER_TO_NAME, PRIMARY_COLOR, SECONDARY_COLOR, YF_HISTORY_CACHE_TTL
+
+@st.cache_data(ttl=YF_HISTORY_CACHE_TTL, show_spinner=False)
+def _price_chart_spec(chart_df):
+    """Builds the price/SMA chart once per data window and returns its Vega-Lite spec."""
+    import altair as alt  # deferred so the LLM tabs do not pay for altair at import time
+
+    return alt.Chart(chart_df).transform_fold(
+        ['Close', 'SMA_50', 'SMA_200'], as_=['Metric', 'Value']
+    ).mark_line().encode(
+        x='Date:T', y='Value:Q', color='Metric:N'
+    ).properties(height=400).to_dict()
+
+def technical_data_jobs(ticker):
+    """Zero-argument calls that warm this tab's Yahoo Finance cache."""
+    from services.yfinance_service import get_technical_data
+
+    return [lambda: get_technical_data(ticker)]
 
 def render_technical_tab(ticker):
+    # Deferred so the LLM tabs do not pay for yfinance at import time
+    from services.yfinance_service import get_technical_data
+
     stock_name = TICKER_TO_NAME.get(ticker, ticker)
     st.subheader(f"Technical Analysis for {stock_name}")
 
@@ -12,9 +31,9 @@ def render_technical_tab(ticker):
         st.warning("Could not fetch data.")
         return
 
-    chart = alt.Chart(df.reset_index()).transform_fold(
-        ['Close', 'SMA_50', 'SMA_200'], as_=['Metric', 'Value']
-    ).mark_line().encode(
-        x='Date:T', y='Value:Q', color='Metric:N'
-    ).properties(height=400)
-    st.altair_chart(chart, use_container_width=True)
+    # ~5y of daily bars is far more points than the chart can resolve, and
+    # Altair embeds every column of the frame in the spec, so slice down to the
+    # plotted columns before the single reset_index copy
+    chart_df = downsample_for_chart(df[['Close', 'SMA_50', 'SMA_200']]).reset_index()
+    chart_spec = _price_chart_spec(chart_df)
+    st.vega_lite_chart(chart_spec, use_container_width=True)
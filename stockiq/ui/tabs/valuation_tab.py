@@ -1,14 +1,35 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
-from services.yfinance_service import calculate_dcf, get_valuation_and_peer_data
-from config.settings import TICKER_TO_NAME, PEER_TICKERS, PRIMARY_COLOR, SECONDARY_COLOR
+from config.settings import TICKER_TO_NAME, PEER_TICKERS, PRIMARY_COLOR, SECONDARY_COLOR, YF_CACHE_TTL
+
+@st.cache_data(ttl=YF_CACHE_TTL, show_spinner=False)
+def _pe_chart_spec(df, ticker):
+    """Builds the P/E comparison chart once per (data, ticker) and returns its Vega-Lite spec."""
+    import altair as alt  # deferred so the LLM tabs do not pay for altair at import time
+
+    return alt.Chart(df).mark_bar().encode(
+        x="Stock:N", y="P/E (TTM):Q",
+        color=alt.condition(alt.datum.Stock == ticker, alt.value(SECONDARY_COLOR), alt.value(PRIMARY_COLOR)),
+        tooltip=["Stock", "P/E (TTM)"]
+    ).properties(title="P/E Comparison").interactive().to_dict()
+
+def valuation_data_jobs(ticker):
+    """Zero-argument calls that warm this tab's Yahoo Finance caches."""
+    from services.yfinance_service import calculate_dcf, get_valuation_and_peer_data
+
+    peers = PEER_TICKERS.get(ticker, PEER_TICKERS["DEFAULT"])
+    # One job: the DCF reads the company .info the metrics call has just cached
+    return [lambda: (get_valuation_and_peer_data(ticker, peers), calculate_dcf(ticker))]
 
 def render_valuation_tab(ticker):
+    # Deferred so the LLM tabs do not pay for yfinance at import time
+    from services.yfinance_service import calculate_dcf, get_valuation_and_peer_data
+
     stock_name = TICKER_TO_NAME.get(ticker, ticker)
     st.subheader(f"Valuation & Quality for {stock_name} ({ticker})")
 
-    peers = PEER_TICKERS.get(ticker, ["NIFTYBEES.NS"])
+    peers = PEER_TICKERS.get(ticker, PEER_TICKERS["DEFAULT"])
+    # The DCF runs second so it reuses the company .info cached by the metrics call
     metrics = get_valuation_and_peer_data(ticker, peers)
     dcf = calculate_dcf(ticker)
 
@@ -19,12 +40,11 @@ def render_valuation_tab(ticker):
     st.metric("Intrinsic Value (DCF)", f"₹{dcf['intrinsic_value']}", f"{dcf['margin_of_safety']}% MoS")
     st.metric("Current Market Price", f"₹{dcf['current_price']}")
 
-    df = pd.DataFrame(metrics["peer_comparison"])
-    chart = alt.Chart(df).mark_bar().encode(
-        x="Stock:N", y="P/E (TTM):Q",
-        color=alt.condition(alt.datum.Stock == ticker, alt.value(SECONDARY_COLOR), alt.value(PRIMARY_COLOR)),
-        tooltip=["Stock", "P/E (TTM)"]
-    ).properties(title="P/E Comparison").interactive()
-    st.altair_chart(chart, use_container_width=True)
+    # Company row first so the highlighted bar sits next to its peers; built
+    # in one DataFrame call from plain dicts rather than concatenating frames.
+    company_row = {"Stock": ticker, **metrics["company_valuation"]}
+    df = pd.DataFrame([company_row, *metrics["peer_comparison"]])
+    st.vega_lite_chart(_pe_chart_spec(df, ticker), use_container_width=True)
 
-    st.dataframe(pd.DataFrame(metrics["quality_ratios"].items(), columns=["Ratio", "Value"]))
+    quality_ratios = metrics["quality_ratios"]
+    st.dataframe(pd.DataFrame({"Ratio": list(quality_ratios), "Value": list(quality_ratios.values())}))
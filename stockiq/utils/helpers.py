@@ -1,5 +1,14 @@
 import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+def backoff_delay(attempt, base=1, cap=30):
+    """Exponential backoff for retry `attempt` (0-based) with up to 50% random jitter, capped at `cap` seconds."""
+    delay = base * 2 ** attempt
+    return min(cap, delay + random.uniform(0, 0.5 * delay))
 
 def retry_operation(func, retries=3, delay=1):
     """Generic retry decorator for transient API issues."""
@@ -9,7 +18,38 @@ def retry_operation(func, retries=3, delay=1):
         except Exception as e:
             if attempt < retries - 1:
                 st.warning(f"Retry {attempt+1}/{retries} failed: {e}")
-                time.sleep(delay)
+                time.sleep(backoff_delay(attempt, delay))
             else:
                 st.error(f"Operation failed after {retries} attempts.")
                 raise
+
+def downsample_for_chart(df, target=400):
+    """Keeps at most `target` evenly spaced rows so charts ship less JSON to the browser."""
+    step = max(1, -(-len(df) // target))
+    # Offset the stride so the last row (the latest close) is always kept
+    return df.iloc[(len(df) - 1) % step::step]
+
+def run_concurrently(*funcs):
+    """Runs zero-argument callables on worker threads and returns their results in order.
+
+    The caller's Streamlit script context is attached to each worker so that
+    st.warning/st.error calls made inside them still render.
+    """
+    ctx = get_script_run_ctx()
+
+    def call(func):
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return func()
+
+    with ThreadPoolExecutor(max_workers=max(1, len(funcs))) as executor:
+        return list(executor.map(call, funcs))
+
+def run_llm_jobs(jobs):
+    """Runs LLM jobs concurrently and stores each job's session_state updates.
+
+    A job is a zero-argument callable returning a dict of session_state
+    entries; the updates are applied on the script thread once all finish.
+    """
+    for updates in run_concurrently(*jobs):
+        st.session_state.update(updates)
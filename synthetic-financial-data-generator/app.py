@@ -1,36 +1,64 @@
 """
 Main Gradio application for Synthetic Financial Dataset Generator.
 """
+import hashlib
+import importlib
+import queue
+import threading
+import time
 import gradio as gr
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from loguru import logger
 
 from src.config.settings import settings, DOMAINS, EXPORT_FORMATS
 from src.llm.gemini_client import GeminiClient
-from src.generators.capital_markets import CapitalMarketsGenerator
-from src.generators.banking import BankingGenerator
-from src.generators.private_equity import PrivateEquityGenerator
-from src.generators.venture_capital import VentureCapitalGenerator
+from src.generators.base_generator import batch_listener
 from src.utils.data_exporter import DataExporter
+from src.utils.dataset_cache import DatasetCache
 from src.utils.metrics_calculator import MetricsCalculator
 from src.validators.search_validator import SearchValidator
 from src.utils.logger import setup_logger
 
 
+# Domain generators are imported and instantiated on first use (see get_generator)
+GENERATOR_CLASSES = {
+    "Capital Markets": ("src.generators.capital_markets", "CapitalMarketsGenerator"),
+    "Banking": ("src.generators.banking", "BankingGenerator"),
+    "Private Equity": ("src.generators.private_equity", "PrivateEquityGenerator"),
+    "Venture Capital": ("src.generators.venture_capital", "VentureCapitalGenerator")
+}
+
+# Domain and dataset choices for the dropdowns, built once
+DOMAIN_NAMES = tuple(DOMAINS.keys())
+DATASET_CHOICES = {domain: DOMAINS[domain].get("datasets", []) for domain in DOMAIN_NAMES}
+
+# A successful Gemini connection test is remembered this long (seconds), so
+# auto-reloads during development do not spend an API call on every restart
+CONNECTION_CHECK_TTL = 300
+CONNECTION_CHECK_DIR = Path.home() / ".cache" / "synthetic-financial-data-generator"
+
+# Generations currently running; above settings.validation_shed_active_jobs the
+# optional Google Search validation is skipped to keep response times bounded
+_active_generations = 0
+_active_generations_lock = threading.Lock()
+
+# Metadata columns added by BaseGenerator.add_metadata (kept in the export,
+# left out of the quality metrics and the preview)
+META_COLUMN_PREFIXES = ("_meta_", "_generated")
+
 # Initialize components
 try:
     settings.validate_api_keys()
     settings.create_output_dir()
     
     gemini_client = GeminiClient()
-    capital_markets_gen = CapitalMarketsGenerator(gemini_client)
-    banking_gen = BankingGenerator(gemini_client)
-    private_equity_gen = PrivateEquityGenerator(gemini_client)
-    venture_capital_gen = VentureCapitalGenerator(gemini_client)
     
     exporter = DataExporter()
+    dataset_cache = DatasetCache()
     metrics_calc = MetricsCalculator()
     search_validator = SearchValidator()
     
@@ -40,12 +68,58 @@ except Exception as e:
     raise
 
 
+@lru_cache(maxsize=None)
+def get_generator(domain: str):
+    """
+    Import and instantiate the generator for a domain on first use.
+    
+    Args:
+        domain: Financial domain (a key of GENERATOR_CLASSES)
+    
+    Returns:
+        Shared generator instance for the domain
+    """
+    module_name, class_name = GENERATOR_CLASSES[domain]
+    generator_class = getattr(importlib.import_module(module_name), class_name)
+    return generator_class(gemini_client)
+
+
 def update_dataset_choices(domain: str) -> gr.Dropdown:
     """Update dataset choices based on selected domain."""
-    datasets = DOMAINS.get(domain, {}).get("datasets", [])
+    datasets = DATASET_CHOICES.get(domain, [])
     return gr.Dropdown(choices=datasets, value=datasets[0] if datasets else None)
 
 
+def _search_sources_html(domain: str, dataset_type: str, busy: bool = False) -> str:
+    """
+    Run the Google Search validation and render its sources as HTML.
+    
+    Under load (busy app or search quota) the last known sources are
+    served instead of running new searches.
+    
+    Args:
+        domain: Financial domain
+        dataset_type: Type of dataset
+        busy: Whether many generations are running concurrently
+    
+    Returns:
+        HTML with validation sources
+    """
+    if busy or search_validator.is_under_load():
+        logger.info(f"Search validation deferred under load for {domain} - {dataset_type}")
+        sources = search_validator.get_last_sources(domain, dataset_type)
+        if sources:
+            return search_validator.format_sources_html(sources)
+        return "<p>⚠️ Validation deferred under load</p>"
+    
+    try:
+        sources = search_validator.validate_domain_patterns(domain, dataset_type)
+        return search_validator.format_sources_html(sources)
+    except Exception as e:
+        logger.warning(f"Search validation failed: {str(e)}")
+        return "<p>⚠️ Search validation unavailable</p>"
+
+
 def generate_dataset(
     domain: str,
     dataset_type: str,
@@ -54,11 +128,15 @@ def generate_dataset(
     end_date: str,
     format_type: str,
     include_validation: bool,
+    regenerate: bool = False,
     progress=gr.Progress()
 ):
     """
     Main function to generate synthetic dataset.
     
+    A generator: Gradio streams each yielded tuple to the UI, so the preview
+    fills in batch by batch while Gemini is still producing records.
+    
     Args:
         domain: Financial domain
         dataset_type: Type of dataset
@@ -67,64 +145,104 @@ def generate_dataset(
         end_date: End date for time-series data
         format_type: Export format
         include_validation: Whether to include Google Search validation
+        regenerate: Skip the dataset cache and call Gemini even for a repeat request
         progress: Gradio progress tracker
     
-    Returns:
+    Yields:
         Tuple of (dataframe preview, metrics HTML, sources HTML, file path, status message)
     """
+    global _active_generations
+    with _active_generations_lock:
+        _active_generations += 1
+        busy = _active_generations > settings.validation_shed_active_jobs
+    
     try:
         progress(0, desc="Initializing generation...")
         logger.info(f"Starting generation: {domain} - {dataset_type} - {num_records} records")
         
         # Validate inputs
         if not domain or not dataset_type:
-            return None, "", "", None, "❌ Please select domain and dataset type"
+            yield None, "", "", None, "❌ Please select domain and dataset type"
+            return
         
         if num_records < 10 or num_records > settings.max_records:
-            return None, "", "", None, f"❌ Number of records must be between 10 and {settings.max_records}"
+            yield None, "", "", None, f"❌ Number of records must be between 10 and {settings.max_records}"
+            return
         
         # Select appropriate generator
         progress(0.1, desc="Selecting generator...")
-        if domain == "Capital Markets":
-            generator = capital_markets_gen
-        elif domain == "Banking":
-            generator = banking_gen
-        elif domain == "Private Equity":
-            generator = private_equity_gen
-        elif domain == "Venture Capital":
-            generator = venture_capital_gen
-        else:
-            return None, "", "", None, f"❌ Generator for {domain} not yet implemented"
+        if domain not in GENERATOR_CLASSES:
+            yield None, "", "", None, f"❌ Generator for {domain} not yet implemented"
+            return
+        generator = get_generator(domain)
         
-        # Generate data
-        progress(0.2, desc=f"Generating {num_records} records...")
-        df = generator.generate(
-            dataset_type=dataset_type,
-            num_records=num_records,
-            start_date=start_date if start_date else None,
-            end_date=end_date if end_date else None
-        )
+        # Finished batches are handed over through a queue so this function can
+        # yield partial previews while generation runs on a worker thread
+        batch_updates = queue.Queue()
         
-        if df.empty:
-            return None, "", "", None, "❌ Generation failed - no data produced"
+        def run_generation():
+            batch_listener.set(lambda done, total, records: batch_updates.put((done, total, records)))
+            return generator.generate(
+                dataset_type=dataset_type,
+                num_records=num_records,
+                start_date=start_date if start_date else None,
+                end_date=end_date if end_date else None
+            )
         
-        progress(0.6, desc="Calculating quality metrics...")
-        # Calculate metrics
-        metrics = metrics_calc.calculate_all_metrics(df)
-        metrics_html = metrics_calc.format_metrics_html(metrics)
+        # An identical earlier request is served from the dataset cache
+        cache_args = (
+            domain, dataset_type, generator.prompt_template(dataset_type),
+            num_records, start_date or None, end_date or None
+        )
+        df = None if regenerate else dataset_cache.get(*cache_args)
         
-        # Validation with Google Search
-        sources_html = ""
-        if include_validation:
-            progress(0.7, desc="Validating with Google Search...")
-            try:
-                sources = search_validator.validate_domain_patterns(domain, dataset_type)
-                sources_html = search_validator.format_sources_html(sources)
-            except Exception as e:
-                logger.warning(f"Search validation failed: {str(e)}")
-                sources_html = "<p>⚠️ Search validation unavailable</p>"
-        else:
-            sources_html = "<p>Search validation was not requested</p>"
+        # Validation with Google Search only depends on the domain and dataset
+        # type, so it runs on a worker thread while Gemini generates the records
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            validation_future = (
+                executor.submit(_search_sources_html, domain, dataset_type, busy)
+                if include_validation else None
+            )
+            
+            if df is not None:
+                progress(0.6, desc="Loaded previously generated dataset")
+            else:
+                # Generate data
+                progress(0.2, desc=f"Generating {num_records} records...")
+                generation_future = executor.submit(run_generation)
+                
+                preview_records = []
+                while not generation_future.done() or not batch_updates.empty():
+                    try:
+                        done, total, records = batch_updates.get(timeout=0.5)
+                    except queue.Empty:
+                        continue
+                    preview_records.extend(records[:100 - len(preview_records)])
+                    progress(0.2 + 0.4 * done / total, desc=f"Generated batch {done}/{total}...")
+                    yield pd.DataFrame(preview_records), "", "", None, f"⏳ Generated batch {done}/{total}..."
+                
+                df = generation_future.result()
+                
+                if df.empty:
+                    yield None, "", "", None, "❌ Generation failed - no data produced"
+                    return
+                
+                dataset_cache.put(df, *cache_args)
+            
+            # Metadata columns depend only on the schema; drop them once
+            meta_cols = [col for col in df.columns if col.startswith(META_COLUMN_PREFIXES)]
+            df_public = df.drop(columns=meta_cols)
+            
+            progress(0.6, desc="Calculating quality metrics...")
+            # Calculate metrics
+            metrics = metrics_calc.calculate_all_metrics(df_public)
+            metrics_html = metrics_calc.format_metrics_html(metrics)
+            
+            if validation_future is not None:
+                progress(0.7, desc="Waiting for Google Search validation...")
+                sources_html = validation_future.result()
+            else:
+                sources_html = "<p>Search validation was not requested</p>"
         
         progress(0.8, desc=f"Exporting to {format_type}...")
         # Export data
@@ -134,27 +252,28 @@ def generate_dataset(
         filepath = exporter.export(
             df,
             filename=filename,
-            format_type=format_type
+            format_type=format_type,
+            metrics=metrics
         )
         
         progress(1.0, desc="Complete!")
         
         # Prepare preview (first 100 rows)
-        df_preview = df.head(100)
-        
-        # Remove metadata columns from preview
-        meta_cols = [col for col in df_preview.columns if col.startswith('_meta_') or col.startswith('_generated')]
-        df_preview = df_preview.drop(columns=meta_cols, errors='ignore')
+        df_preview = df_public.head(100)
         
         success_msg = f"✅ Successfully generated {len(df)} records and exported to {filepath.name}"
         logger.info(success_msg)
         
-        return df_preview, metrics_html, sources_html, str(filepath), success_msg
+        yield df_preview, metrics_html, sources_html, str(filepath), success_msg
         
     except Exception as e:
         error_msg = f"❌ Error: {str(e)}"
         logger.error(f"Generation failed: {str(e)}", exc_info=True)
-        return None, "", "", None, error_msg
+        yield None, "", "", None, error_msg
+    
+    finally:
+        with _active_generations_lock:
+            _active_generations -= 1
 
 
 def validate_with_search(domain: str, dataset_type: str):
@@ -185,6 +304,16 @@ def validate_with_search(domain: str, dataset_type: str):
         return f"<p>❌ Validation failed: {str(e)}</p>"
 
 
+def default_start_date() -> str:
+    """Default start date: one year before today (evaluated on each page load)."""
+    return (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+
+
+def default_end_date() -> str:
+    """Default end date: today (evaluated on each page load)."""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
 # Build Gradio Interface
 def build_interface():
     """Build and configure Gradio interface."""
@@ -222,14 +351,14 @@ def build_interface():
                 gr.Markdown("### 📋 Configuration")
                 
                 domain = gr.Dropdown(
-                    choices=list(DOMAINS.keys()),
+                    choices=list(DOMAIN_NAMES),
                     label="Financial Domain",
-                    value=list(DOMAINS.keys())[0],
+                    value=DOMAIN_NAMES[0],
                     info="Select the financial domain"
                 )
                 
                 dataset_type = gr.Dropdown(
-                    choices=DOMAINS[list(DOMAINS.keys())[0]]["datasets"],
+                    choices=DATASET_CHOICES[DOMAIN_NAMES[0]],
                     label="Dataset Type",
                     info="Select the type of dataset to generate"
                 )
@@ -246,20 +375,20 @@ def build_interface():
                 with gr.Row():
                     start_date = gr.Textbox(
                         label="Start Date (YYYY-MM-DD)",
-                        value=(datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d"),
+                        value=default_start_date,
                         info="For time-series data"
                     )
                     
                     end_date = gr.Textbox(
                         label="End Date (YYYY-MM-DD)",
-                        value=datetime.now().strftime("%Y-%m-%d"),
+                        value=default_end_date,
                         info="For time-series data"
                     )
                 
                 format_type = gr.Dropdown(
                     choices=list(EXPORT_FORMATS.keys()),
                     label="Export Format",
-                    value="CSV",
+                    value="Parquet",
                     info="Choose output format"
                 )
                 
@@ -269,6 +398,12 @@ def build_interface():
                     info="Cross-reference with real-world data patterns"
                 )
                 
+                regenerate = gr.Checkbox(
+                    label="Regenerate (skip cache)",
+                    value=False,
+                    info="Call Gemini again even if this exact dataset was generated before"
+                )
+                
                 with gr.Row():
                     generate_btn = gr.Button("🚀 Generate Dataset", variant="primary", size="lg")
                     validate_btn = gr.Button("🔍 Validate Only", variant="secondary")
@@ -317,7 +452,8 @@ def build_interface():
                 start_date,
                 end_date,
                 format_type,
-                include_validation
+                include_validation,
+                regenerate
             ],
             outputs=[
                 data_preview,
@@ -350,19 +486,54 @@ def build_interface():
     return app
 
 
+def check_gemini_connection() -> bool:
+    """
+    Test the Gemini connection, reusing a recent success for the same API key.
+    
+    Returns:
+        True if the connection works (or was verified within CONNECTION_CHECK_TTL)
+    """
+    key_hash = hashlib.sha256(settings.gemini_api_key.encode()).hexdigest()[:16]
+    marker = CONNECTION_CHECK_DIR / f"gemini_ok_{key_hash}"
+    
+    try:
+        if time.time() - marker.stat().st_mtime < CONNECTION_CHECK_TTL:
+            logger.info("Gemini connection verified recently; skipping test")
+            return True
+    except OSError:
+        pass
+    
+    if not gemini_client.test_connection():
+        return False
+    
+    try:
+        CONNECTION_CHECK_DIR.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+    except OSError as e:
+        logger.debug(f"Could not record connection check: {str(e)}")
+    return True
+
+
 def main():
     """Main entry point."""
     try:
         logger.info("Starting Synthetic Financial Dataset Generator")
         
         # Test Gemini connection
-        if not gemini_client.test_connection():
+        if not check_gemini_connection():
             logger.error("Failed to connect to Gemini API")
             raise Exception("Gemini API connection failed. Please check your API key.")
         
         # Build and launch app
         app = build_interface()
         
+        # Let several generations run at once (each is mostly waiting on
+        # Gemini) and bound the backlog instead of queueing without limit
+        app.queue(
+            default_concurrency_limit=settings.gradio_concurrency_limit,
+            max_size=settings.gradio_queue_max_size
+        )
+        
         app.launch(
             server_name=settings.gradio_server_name,
             server_port=settings.gradio_server_port,
@@ -1,4 +1,4 @@
 """Configuration module."""
-from src.config.settings import settings, DOMAINS, EXPORT_FORMATS
+from src.config.settings import settings, get_settings, DOMAINS, EXPORT_FORMATS
 
-__all__ = ['settings', 'DOMAINS', 'EXPORT_FORMATS']
\ No newline at end of file
+__all__ = ['settings', 'get_settings', 'DOMAINS', 'EXPORT_FORMATS']
\ No newline at end of file
@@ -1,6 +1,9 @@
 """
 LLM prompt templates for different financial domains and datasets.
 """
+from typing import Dict, Tuple
+from loguru import logger
+from src.config.settings import DOMAINS
 
 # Base system prompt
 SYSTEM_PROMPT = """You are an expert financial data engineer specializing in generating realistic, 
@@ -74,6 +77,31 @@ Constraints:
 - Split ratios like 2:1, 3:1, 3:2
 - Actions should align with realistic corporate behavior
 
+Return as JSON array of objects.""",
+
+    "trading_volumes": """Generate {num_records} trading volume records:
+
+Required fields:
+- ticker: Stock ticker
+- date: Trading date between {start_date} and {end_date}
+- volume: Total trading volume
+- trade_count: Number of trades
+- vwap: Volume weighted average price
+- market_cap_mm: Market cap in millions
+
+Return as JSON array of objects.""",
+
+    "market_indices": """Generate {num_records} market index records:
+
+Required fields:
+- index_name: Index name (S&P 500, NASDAQ, FTSE 100, etc.)
+- date: Date between {start_date} and {end_date}
+- value: Index value
+- change: Daily change
+- change_pct: Daily change percentage
+- volume: Total market volume
+- market_cap_trillion: Total market cap in trillions
+
 Return as JSON array of objects."""
 }
 
@@ -144,6 +172,41 @@ Constraints:
 - IRR typically 15% to 40% for successful deals
 - MOIC and IRR should be mathematically consistent
 
+Return as JSON array of objects.""",
+
+    "capital_calls": """Generate {num_records} capital call and distribution records:
+
+Required fields:
+- fund_name: Fund name
+- transaction_type: Type (Capital Call, Distribution)
+- transaction_date: Date between {start_date} and {end_date}
+- amount_mm: Amount in millions
+- investor_name: Investor name
+- percentage_of_commitment: Percentage of total commitment
+- cumulative_called_pct: Cumulative capital called percentage
+- cumulative_distributed_pct: Cumulative distributions percentage
+
+Return as JSON array of objects.""",
+
+    "valuations": """Generate {num_records} portfolio company valuation records:
+
+Required fields:
+- company_name: Portfolio company name
+- valuation_date: Valuation date between {start_date} and {end_date}
+- enterprise_value_mm: Enterprise value in millions
+- equity_value_mm: Equity value in millions
+- ebitda_mm: EBITDA in millions
+- revenue_mm: Revenue in millions
+- ev_ebitda_multiple: EV/EBITDA multiple
+- ev_revenue_multiple: EV/Revenue multiple
+- net_debt_mm: Net debt in millions
+- valuation_method: Method (DCF, Comparable Companies, Precedent Transactions)
+
+Constraints:
+- EV/EBITDA typically 8x to 15x
+- EV/Revenue typically 1x to 5x
+- Enterprise Value = Equity Value + Net Debt
+
 Return as JSON array of objects."""
 }
 
@@ -210,6 +273,41 @@ Constraints:
 - VCs get Preferred shares, employees get Common
 - Later round investors have later Preferred series
 
+Return as JSON array of objects.""",
+
+    "investor_syndicates": """Generate {num_records} investor syndicate records:
+
+Required fields:
+- deal_name: Deal/company name
+- round_type: Round type (Seed, Series A, B, C, etc.)
+- round_date: Date between {start_date} and {end_date}
+- lead_investor: Lead investor name
+- co_investors: List of co-investor names (comma-separated)
+- total_investors: Total number of investors
+- lead_investment_mm: Lead investor amount in millions
+- total_round_mm: Total round size in millions
+- lead_ownership_pct: Lead investor ownership percentage
+
+Return as JSON array of objects.""",
+
+    "exit_scenarios": """Generate {num_records} startup exit records:
+
+Required fields:
+- startup_name: Company name
+- exit_date: Exit date between {start_date} and {end_date}
+- exit_type: Type (IPO, Acquisition, Merger, Secondary Sale, Shutdown)
+- exit_valuation_mm: Exit valuation in millions
+- total_funding_mm: Total funding raised in millions
+- return_multiple: Multiple on invested capital
+- years_to_exit: Years from founding to exit
+- acquirer_name: Acquirer name (for acquisitions)
+- outcome: Outcome (Unicorn Exit, Successful, Modest, Failed)
+
+Constraints:
+- Successful exits typically 3-10 years
+- Return multiples 2x to 100x for successful, <1x for failed
+- IPO valuations typically $500M+
+
 Return as JSON array of objects."""
 }
 
@@ -310,9 +408,81 @@ Constraints:
 - 95% Completed, 4% Pending, 1% Failed
 - Amounts realistic for category (ATM: $20-$500, Salary: $2K-$10K)
 
+Return as JSON array of objects.""",
+
+    "credit_scores": """Generate {num_records} credit score records:
+
+Required fields:
+- customer_id: Customer identifier
+- score_date: Date of score calculation
+- credit_score: Score (300-850)
+- score_model: Model used (FICO, VantageScore, Custom)
+- payment_history: Payment history score (0-100)
+- credit_utilization_pct: Credit utilization percentage
+- credit_age_months: Age of oldest account in months
+- total_accounts: Total number of accounts
+- recent_inquiries: Hard inquiries in last 12 months
+- derogatory_marks: Number of derogatory marks
+- risk_category: Category (Excellent, Good, Fair, Poor)
+
+Constraints:
+- Excellent: 750-850
+- Good: 700-749
+- Fair: 650-699
+- Poor: 300-649
+- Utilization typically 0-100%
+- Age 1-360 months
+
 Return as JSON array of objects."""
 }
 
+PROMPT_MAP = {
+    "capital_markets": CAPITAL_MARKETS_PROMPTS,
+    "private_equity": PRIVATE_EQUITY_PROMPTS,
+    "venture_capital": VENTURE_CAPITAL_PROMPTS,
+    "banking": BANKING_PROMPTS
+}
+
+
+def _normalize_key(name: str) -> str:
+    """Normalize a domain or dataset display name to a prompt key."""
+    return name.lower().replace(" ", "_").replace("(", "").replace(")", "").replace("/", "_")
+
+
+def _build_prompt_aliases() -> Dict[Tuple[str, str], str]:
+    """
+    Map every known (domain, dataset) key to its prompt key.
+    
+    Each prompt key is an alias of itself, and each dataset listed in
+    DOMAINS is an alias of the prompt key it contains (or is contained in).
+    
+    Returns:
+        Dict of (domain key, dataset key) -> prompt key
+    """
+    aliases = {}
+    
+    for domain_key, prompts in PROMPT_MAP.items():
+        for key in prompts:
+            aliases[(domain_key, key)] = key
+    
+    for domain, config in DOMAINS.items():
+        domain_key = _normalize_key(domain)
+        prompts = PROMPT_MAP.get(domain_key, {})
+        
+        for dataset in config.get("datasets", []):
+            dataset_key = _normalize_key(dataset)
+            matches = [key for key in prompts if key in dataset_key or dataset_key in key]
+            if len(matches) > 1:
+                logger.warning(f"Dataset '{dataset}' matches several prompts: {matches}; using {matches[0]}")
+            if matches:
+                aliases.setdefault((domain_key, dataset_key), matches[0])
+    
+    return aliases
+
+
+PROMPT_ALIASES = _build_prompt_aliases()
+
+
 def get_prompt(domain: str, dataset_type: str, **kwargs) -> str:
     """
     Get the appropriate prompt template for a domain and dataset type.
@@ -325,26 +495,13 @@ def get_prompt(domain: str, dataset_type: str, **kwargs) -> str:
     Returns:
         Formatted prompt string
     """
-    domain_key = domain.lower().replace(" ", "_")
-    dataset_key = dataset_type.lower().replace(" ", "_").replace("(", "").replace(")", "").replace("/", "_")
-    
-    prompt_map = {
-        "capital_markets": CAPITAL_MARKETS_PROMPTS,
-        "private_equity": PRIVATE_EQUITY_PROMPTS,
-        "venture_capital": VENTURE_CAPITAL_PROMPTS,
-        "banking": BANKING_PROMPTS
-    }
-    
-    prompts = prompt_map.get(domain_key, {})
-    
-    # Find matching prompt key
-    for key in prompts.keys():
-        if key in dataset_key or dataset_key in key:
-            template = prompts[key]
-            return template.format(**kwargs)
+    domain_key = _normalize_key(domain)
+    template_key = PROMPT_ALIASES.get((domain_key, _normalize_key(dataset_type)))
+    if template_key is not None:
+        return PROMPT_MAP[domain_key][template_key].format(**kwargs)
     
     # Default generic prompt if no match
     return f"""Generate {kwargs.get('num_records', 100)} realistic {dataset_type} records for the {domain} domain.
     
     Return data as a JSON array of objects with appropriate fields for this dataset type.
-    Ensure data is realistic, follows industry standards, and maintains consistency."""
\ No newline at end of file
+    Ensure data is realistic, follows industry standards, and maintains consistency."""
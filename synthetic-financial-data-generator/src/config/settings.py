@@ -1,7 +1,7 @@
 """
 Configuration settings for the Synthetic Financial Dataset Generator.
 """
-import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 try:
@@ -10,8 +10,13 @@ try:
 except ImportError:
     from pydantic import BaseSettings, Field
 
-# Load environment variables
-load_dotenv()
+# The project's .env, resolved from this file rather than the working
+# directory, so `python synthetic-financial-data-generator/app.py` works too
+ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
+
+# Load environment variables (into os.environ as well, for libraries that
+# read it directly)
+load_dotenv(ENV_FILE)
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -30,7 +35,14 @@ class Settings(BaseSettings):
     
     # Rate Limiting
     gemini_requests_per_minute: int = Field(default=60, env="GEMINI_REQUESTS_PER_MINUTE")
+    gemini_max_concurrency: int = Field(default=4, env="GEMINI_MAX_CONCURRENCY")
     search_requests_per_day: int = Field(default=100, env="SEARCH_REQUESTS_PER_DAY")
+    search_cache_ttl: int = Field(default=3600, env="SEARCH_CACHE_TTL")
+    search_burst_limit: int = Field(default=30, env="SEARCH_BURST_LIMIT")
+    
+    # LLM Response Cache (only near-deterministic, low-temperature calls)
+    llm_cache_max_temperature: float = Field(default=0.2, env="LLM_CACHE_MAX_TEMPERATURE")
+    llm_cache_ttl: int = Field(default=86400, env="LLM_CACHE_TTL")
     
     # Data Generation Settings
     include_nulls: bool = Field(default=False, env="INCLUDE_NULLS")
@@ -41,9 +53,12 @@ class Settings(BaseSettings):
     gradio_server_name: str = Field(default="0.0.0.0", env="GRADIO_SERVER_NAME")
     gradio_server_port: int = Field(default=7860, env="GRADIO_SERVER_PORT")
     gradio_share: bool = Field(default=False, env="GRADIO_SHARE")
+    gradio_concurrency_limit: int = Field(default=8, env="GRADIO_CONCURRENCY_LIMIT")
+    gradio_queue_max_size: int = Field(default=32, env="GRADIO_QUEUE_MAX_SIZE")
+    validation_shed_active_jobs: int = Field(default=6, env="VALIDATION_SHED_ACTIVE_JOBS")
     
     class Config:
-        env_file = ".env"
+        env_file = ENV_FILE
         case_sensitive = False
     
     def validate_api_keys(self) -> bool:
@@ -57,8 +72,19 @@ class Settings(BaseSettings):
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Build the settings once and return the same instance afterwards.
+    
+    Returns:
+        Shared Settings instance
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 # Domain configurations
 DOMAINS = {
@@ -104,12 +130,12 @@ DOMAINS = {
     }
 }
 
-# Export format configurations
+# Export format configurations (first entry is the UI default)
 EXPORT_FORMATS = {
+    "Parquet": {"extension": ".parquet", "description": "Apache Parquet columnar format (zstd-compressed, dictionary-encoded)"},
     "CSV": {"extension": ".csv", "description": "Comma-separated values"},
     "JSON": {"extension": ".json", "description": "JavaScript Object Notation"},
     "XML": {"extension": ".xml", "description": "Extensible Markup Language"},
-    "Parquet": {"extension": ".parquet", "description": "Apache Parquet columnar format"},
     "Excel": {"extension": ".xlsx", "description": "Microsoft Excel format"}
 }
 
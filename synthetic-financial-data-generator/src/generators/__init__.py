@@ -1,6 +1,6 @@
 """Data generators module."""
-from src.generators.base_generator import BaseGenerator
+from src.generators.base_generator import BaseGenerator, DatasetSpec
 from src.generators.capital_markets import CapitalMarketsGenerator
 from src.generators.banking import BankingGenerator
 
-__all__ = ['BaseGenerator', 'CapitalMarketsGenerator', 'BankingGenerator']
\ No newline at end of file
+__all__ = ['BaseGenerator', 'DatasetSpec', 'CapitalMarketsGenerator', 'BankingGenerator']
\ No newline at end of file
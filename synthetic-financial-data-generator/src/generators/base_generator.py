@@ -1,18 +1,54 @@
 """
 Base generator class for all domain-specific generators.
 """
-from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AbstractSet, Callable, ClassVar, Dict, List, Any, Mapping, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime, timedelta
 from loguru import logger
 from src.llm.gemini_client import GeminiClient
 from src.config.prompts import get_prompt
+from src.config.settings import settings
+
+
+# Optional callback invoked as (batches_done, total_batches, batch_records) each
+# time a batch finishes, for streaming partial results. A ContextVar so that
+# concurrent requests, each on its own thread, only see their own listener.
+batch_listener: ContextVar[Optional[Callable[[int, int, List[Dict[str, Any]]], None]]] = ContextVar(
+    "batch_listener", default=None
+)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """How to generate one dataset type."""
+    
+    prompt: str
+    batch_size: int = 100
+    needs_dates: bool = False
+    # Columns holding dates, parsed with the fast ISO 8601 path
+    date_columns: Tuple[str, ...] = ()
+    metadata: Mapping[str, Any] = field(default_factory=dict)
 
 
 class BaseGenerator(ABC):
     """Abstract base class for financial data generators."""
     
+    # Generators only hold their client and domain; slots keep instances
+    # small and make attribute access a fixed-offset load
+    __slots__ = ("llm_client", "domain")
+    
+    # Value of the _meta_domain column
+    _METADATA_DOMAIN: ClassVar[str] = ""
+    
+    # Dataset type -> how to generate it, filled in by each domain generator
+    _DATASETS: ClassVar[Dict[str, DatasetSpec]] = {}
+    
     def __init__(self, llm_client: GeminiClient):
         """
         Initialize generator.
@@ -24,7 +60,6 @@ class BaseGenerator(ABC):
         self.domain = self.__class__.__name__.replace("Generator", "")
         logger.info(f"Initialized {self.domain} generator")
     
-    @abstractmethod
     def generate(
         self,
         dataset_type: str,
@@ -46,64 +81,266 @@ class BaseGenerator(ABC):
         Returns:
             Generated dataset as DataFrame
         """
-        pass
+        logger.info(f"Generating {num_records} records for {dataset_type}")
+        return self._run(self._spec(dataset_type), num_records, start_date, end_date)
+    
+    def prompt_template(self, dataset_type: str) -> str:
+        """
+        Unformatted prompt template behind a dataset type.
+        
+        Args:
+            dataset_type: Type of dataset
+        
+        Returns:
+            Prompt template string
+        """
+        return self._spec(dataset_type).prompt
+    
+    def _spec(self, dataset_type: str) -> DatasetSpec:
+        """Look up the spec for a dataset type (ValueError if unknown)."""
+        spec = self._DATASETS.get(dataset_type)
+        if not spec:
+            raise ValueError(f"Unknown dataset type: {dataset_type}")
+        return spec
+    
+    def generate_many(
+        self,
+        requests: Sequence[Tuple[str, int]],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Generate several datasets of this domain concurrently.
+        
+        The datasets share the rate-limited Gemini client, so one dataset's
+        requests keep going while another is being converted to a DataFrame.
+        
+        Args:
+            requests: (dataset_type, num_records) pairs
+            start_date: Start date for time-series data
+            end_date: End date for time-series data
+        
+        Returns:
+            Dict of dataset type -> generated DataFrame
+        """
+        max_workers = max(1, min(settings.gemini_max_concurrency, len(requests)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                dataset_type: executor.submit(self.generate, dataset_type, num_records, start_date, end_date)
+                for dataset_type, num_records in requests
+            }
+            return {dataset_type: future.result() for dataset_type, future in futures.items()}
+    
+    def _run(
+        self,
+        spec: DatasetSpec,
+        num_records: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Generate a dataset described by a spec.
+        
+        Args:
+            spec: Dataset spec
+            num_records: Number of records
+            start_date: Start date for time-series data
+            end_date: End date for time-series data
+        
+        Returns:
+            Generated dataset as DataFrame
+        """
+        prompt_kwargs = {}
+        if spec.needs_dates:
+            start_date, end_date = self.get_date_range(start_date, end_date)
+            prompt_kwargs = {"start_date": start_date, "end_date": end_date}
+        
+        df = self._generate_dataframe(
+            spec.prompt,
+            num_records,
+            batch_size=spec.batch_size,
+            date_columns=spec.date_columns or None,
+            **prompt_kwargs
+        )
+        
+        # Add synthetic data marker
+        return self.add_metadata(df, is_synthetic=True, domain=self._METADATA_DOMAIN, **spec.metadata)
     
     def _generate_in_batches(
         self,
         prompt_template: str,
         total_records: int,
         batch_size: int = 100,
+        sink: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
         **kwargs
     ) -> List[Dict[str, Any]]:
         """
         Generate data in batches to handle large datasets.
         
+        Batches are independent Gemini requests, so up to
+        ``settings.gemini_max_concurrency`` of them are in flight at once;
+        records are returned in batch order. Batches of the same size share
+        one prompt, so the template is formatted at most twice.
+        
         Args:
             prompt_template: Prompt template
             total_records: Total records to generate
             batch_size: Records per batch
+            sink: Called with each finished batch, in order, instead of
+                collecting the records (nothing is returned then)
             **kwargs: Variables for prompt
         
         Returns:
             List of generated records
         """
         all_records = []
-        batches = (total_records + batch_size - 1) // batch_size
+        batch_sizes = [
+            min(batch_size, total_records - start)
+            for start in range(0, total_records, batch_size)
+        ]
+        batches = len(batch_sizes)
         
         logger.info(f"Generating {total_records} records in {batches} batches")
         
-        for i in range(batches):
-            records_in_batch = min(batch_size, total_records - len(all_records))
-            logger.info(f"Generating batch {i + 1}/{batches} ({records_in_batch} records)")
-            
-            try:
-                # Generate prompt with current batch size
-                batch_kwargs = {**kwargs, 'num_records': records_in_batch}
-                prompt = prompt_template.format(**batch_kwargs)
-                
-                # Generate data
-                batch_data = self.llm_client.generate_json(prompt)
-                
-                if batch_data:
-                    all_records.extend(batch_data)
-                    logger.debug(f"Batch {i + 1} generated {len(batch_data)} records")
+        try:
+            # Generate prompt for each distinct batch size
+            prompts = {
+                size: prompt_template.format(**{**kwargs, 'num_records': size})
+                for size in set(batch_sizes)
+            }
+        except (KeyError, IndexError, ValueError) as e:
+            logger.error(f"Error formatting prompt: {str(e)}")
+            return all_records
+        
+        max_workers = max(1, min(settings.gemini_max_concurrency, batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._generate_batch, prompts[records_in_batch], i, batches, records_in_batch)
+                for i, records_in_batch in enumerate(batch_sizes)
+            ]
+            listener = batch_listener.get()
+            generated = 0
+            for i, future in enumerate(futures, 1):
+                batch_records = future.result()
+                generated += len(batch_records)
+                # Drop the finished future so its records can be freed once handled
+                futures[i - 1] = None
+                if sink:
+                    sink(batch_records)
                 else:
-                    logger.warning(f"Batch {i + 1} returned no data")
-                    
-            except Exception as e:
-                logger.error(f"Error generating batch {i + 1}: {str(e)}")
-                # Continue with other batches
-                continue
-        
-        logger.info(f"Total records generated: {len(all_records)}")
+                    all_records.extend(batch_records)
+                if listener:
+                    listener(i, batches, batch_records)
+        
+        logger.info(f"Total records generated: {generated}")
         return all_records
     
-    def _validate_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_batch(
+        self,
+        prompt: str,
+        index: int,
+        batches: int,
+        records_in_batch: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate a single batch, returning an empty list on failure.
+        
+        Args:
+            prompt: Formatted prompt for this batch
+            index: Zero-based batch index (for logging)
+            batches: Total number of batches (for logging)
+            records_in_batch: Records requested in this batch (for logging)
+        
+        Returns:
+            Records generated for this batch
+        """
+        # Per-batch messages are debug level with deferred formatting, so
+        # they cost almost nothing unless debug logging is enabled
+        logger.debug("Generating batch {}/{} ({} records)", index + 1, batches, records_in_batch)
+        
+        try:
+            # Generate data
+            batch_data = self.llm_client.generate_json(prompt)
+            
+            if batch_data:
+                logger.debug("Batch {} generated {} records", index + 1, len(batch_data))
+                return batch_data
+            
+            logger.warning(f"Batch {index + 1} returned no data")
+            
+        except Exception as e:
+            logger.error(f"Error generating batch {index + 1}: {str(e)}")
+        
+        # Continue with other batches
+        return []
+    
+    def _generate_dataframe(
+        self,
+        prompt_template: str,
+        total_records: int,
+        batch_size: int = 100,
+        date_columns: Optional[Sequence[str]] = None,
+        **kwargs
+    ) -> pd.DataFrame:
+        """
+        Generate, validate and convert records to a DataFrame batch by batch.
+        
+        Each batch becomes a small DataFrame as soon as it arrives, so only
+        one batch of record dicts is alive at a time instead of all of them.
+        
+        Args:
+            prompt_template: Prompt template
+            total_records: Total records to generate
+            batch_size: Records per batch
+            date_columns: Known date columns (see _infer_types)
+            **kwargs: Variables for prompt
+        
+        Returns:
+            DataFrame
+        """
+        frames = []
+        required_fields = None
+        
+        def add_batch(batch_records: List[Dict[str, Any]]):
+            nonlocal required_fields
+            if not batch_records:
+                return
+            # Fields of the very first record are required in every batch
+            if required_fields is None:
+                required_fields = batch_records[0].keys()
+            valid_records = self._validate_records(batch_records, required_fields)
+            if valid_records:
+                frames.append(self._records_to_frame(valid_records))
+        
+        self._generate_in_batches(
+            prompt_template,
+            total_records,
+            batch_size=batch_size,
+            sink=add_batch,
+            **kwargs
+        )
+        
+        if not frames:
+            logger.warning("No records to convert to DataFrame")
+            return pd.DataFrame()
+        
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        frames.clear()
+        
+        return self._infer_types(df, date_columns)
+    
+    def _validate_records(
+        self,
+        records: List[Dict[str, Any]],
+        required_fields: Optional[AbstractSet[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Validate and clean generated records.
         
         Args:
             records: List of generated records
+            required_fields: Fields every record must have (defaults to
+                the fields of the first record)
         
         Returns:
             Validated and cleaned records
@@ -111,17 +348,17 @@ class BaseGenerator(ABC):
         if not records:
             return []
         
-        # Remove any records with missing required fields
-        valid_records = []
-        required_fields = set(records[0].keys()) if records else set()
+        # Remove any records with missing required fields (a keys-view
+        # superset test runs in C instead of a Python loop over the fields)
+        if required_fields is None:
+            required_fields = records[0].keys()
+        valid_records = [record for record in records if record.keys() >= required_fields]
         
-        for record in records:
-            if all(key in record for key in required_fields):
-                valid_records.append(record)
-            else:
-                logger.warning(f"Skipping invalid record: {record}")
+        skipped = len(records) - len(valid_records)
+        if skipped:
+            logger.warning(f"Skipping {skipped} records missing one of: {list(required_fields)}")
         
-        logger.info(f"Validated {len(valid_records)}/{len(records)} records")
+        logger.debug("Validated {}/{} records", len(valid_records), len(records))
         return valid_records
     
     def _to_dataframe(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -138,17 +375,118 @@ class BaseGenerator(ABC):
             logger.warning("No records to convert to DataFrame")
             return pd.DataFrame()
         
-        df = pd.DataFrame(records)
+        return self._infer_types(self._records_to_frame(records))
+    
+    def _records_to_frame(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Build a DataFrame from flat records via Arrow's C++ builder.
+        
+        Arrow takes its columns from the first record and turns nested
+        values into structs/arrays, so it is only used when every record
+        has the same keys and the first one holds plain scalars; anything
+        else (or a type Arrow rejects) goes through pd.DataFrame.
+        
+        Args:
+            records: List of records
+        
+        Returns:
+            DataFrame
+        """
+        first = records[0]
+        keys = first.keys()
+        flat = (
+            all(value is None or isinstance(value, (str, int, float)) for value in first.values())
+            and all(record.keys() == keys for record in records)
+        )
+        if flat:
+            try:
+                return pa.Table.from_pylist(records).to_pandas(self_destruct=True, split_blocks=True)
+            except (pa.ArrowException, TypeError, ValueError, OverflowError):
+                pass
         
-        # Infer and convert date columns
+        return pd.DataFrame(records)
+    
+    def _infer_types(
+        self,
+        df: pd.DataFrame,
+        date_columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Convert date columns and downcast dtypes of a records DataFrame.
+        
+        Args:
+            df: DataFrame built from generated records
+            date_columns: Known date columns, parsed as ISO 8601 (columns
+                with "date" in the name are inferred if None)
+        
+        Returns:
+            DataFrame
+        """
+        if date_columns is None:
+            # Infer and convert date columns (same ISO 8601 fast path as
+            # declared date columns)
+            for col in df.columns:
+                if 'date' in col.lower():
+                    df[col] = self._parse_dates(df[col])
+        else:
+            for col in date_columns:
+                if col in df.columns:
+                    df[col] = self._parse_dates(df[col])
+        
+        df = self._downcast_dtypes(df)
+        
+        logger.info(f"Created DataFrame with shape {df.shape}")
+        return df
+    
+    def _parse_dates(self, values: pd.Series) -> pd.Series:
+        """
+        Parse a known date column.
+        
+        Tries pandas' dedicated ISO 8601 parser first and falls back to
+        format inference if that would lose values the LLM wrote in another
+        format.
+        
+        Args:
+            values: Column of date strings
+        
+        Returns:
+            Parsed column (unparseable values become NaT)
+        """
+        try:
+            parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+            if parsed.isna().sum() == values.isna().sum():
+                return parsed
+            return pd.to_datetime(values, errors='coerce')
+        except Exception as e:
+            logger.debug(f"Could not convert {values.name} to datetime: {str(e)}")
+            return values
+    
+    def _downcast_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shrink column dtypes so metrics and export touch fewer bytes.
+        
+        Integer columns go to the smallest integer type that holds them and
+        repetitive text columns become categoricals. Float columns stay
+        float64: float32 keeps only ~7 significant digits, which would
+        corrupt prices and balances.
+        
+        Args:
+            df: DataFrame
+        
+        Returns:
+            DataFrame with downcast dtypes
+        """
         for col in df.columns:
-            if 'date' in col.lower():
+            if pd.api.types.is_integer_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], downcast="integer")
+            elif df[col].dtype == object:
                 try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                except Exception as e:
-                    logger.debug(f"Could not convert {col} to datetime: {str(e)}")
+                    if df[col].nunique() < 0.5 * len(df):
+                        df[col] = df[col].astype("category")
+                except TypeError:
+                    # Unhashable values (nested JSON objects/lists) stay as objects
+                    continue
         
-        logger.info(f"Created DataFrame with shape {df.shape}")
         return df
     
     def get_date_range(
@@ -166,11 +504,17 @@ class BaseGenerator(ABC):
         Returns:
             Tuple of (start_date, end_date) as strings
         """
+        if start_date and end_date:
+            return start_date, end_date
+        
+        # One clock read for both defaults, so they agree across midnight
+        now = datetime.now()
+        
         if not start_date:
-            start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+            start_date = (now - timedelta(days=365)).strftime("%Y-%m-%d")
         
         if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
+            end_date = now.strftime("%Y-%m-%d")
         
         return start_date, end_date
     
@@ -185,10 +529,14 @@ class BaseGenerator(ABC):
         Returns:
             DataFrame with metadata
         """
-        for key, value in metadata.items():
-            df[f"_meta_{key}"] = value
+        metadata = {f"_meta_{key}": value for key, value in metadata.items()}
+        metadata["_generated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        metadata["_generator"] = self.domain
         
-        df["_generated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        df["_generator"] = self.domain
+        # Every value is constant per dataset: store it as a one-category
+        # column (an int8 code per row) rather than N object pointers
+        codes = np.zeros(len(df), dtype=np.int8)
+        for column, value in metadata.items():
+            df[column] = pd.Categorical.from_codes(codes, categories=[value])
         
         return df
\ No newline at end of file
@@ -1,41 +1,47 @@
 """
 Venture Capital data generator.
 """
-from typing import Optional
+from typing import ClassVar, Dict, Optional
 import pandas as pd
-from loguru import logger
-from src.generators.base_generator import BaseGenerator
+from src.generators.base_generator import BaseGenerator, DatasetSpec
 from src.config.prompts import VENTURE_CAPITAL_PROMPTS
 
 
 class VentureCapitalGenerator(BaseGenerator):
     """Generator for venture capital datasets."""
     
-    def generate(
-        self,
-        dataset_type: str,
-        num_records: int,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
-        **kwargs
-    ) -> pd.DataFrame:
-        """Generate venture capital dataset."""
-        
-        logger.info(f"Generating {num_records} records for {dataset_type}")
-        
-        dataset_map = {
-            "Startup Profiles": self.generate_startup_profiles,
-            "Funding Rounds": self.generate_funding_rounds,
-            "Cap Tables": self.generate_cap_tables,
-            "Investor Syndicates": self.generate_investor_syndicates,
-            "Exit Scenarios": self.generate_exit_scenarios
-        }
-        
-        generator_func = dataset_map.get(dataset_type)
-        if not generator_func:
-            raise ValueError(f"Unknown dataset type: {dataset_type}")
-        
-        return generator_func(num_records, start_date, end_date, **kwargs)
+    __slots__ = ()
+    
+    _METADATA_DOMAIN: ClassVar[str] = "venture_capital"
+    
+    _DATASETS: ClassVar[Dict[str, DatasetSpec]] = {
+        "Startup Profiles": DatasetSpec(
+            VENTURE_CAPITAL_PROMPTS["startup_profiles"],
+            batch_size=50
+        ),
+        "Funding Rounds": DatasetSpec(
+            VENTURE_CAPITAL_PROMPTS["funding_rounds"],
+            batch_size=50,
+            date_columns=("round_date",)
+        ),
+        "Cap Tables": DatasetSpec(
+            VENTURE_CAPITAL_PROMPTS["cap_tables"],
+            batch_size=50,
+            date_columns=("as_of_date",)
+        ),
+        "Investor Syndicates": DatasetSpec(
+            VENTURE_CAPITAL_PROMPTS["investor_syndicates"],
+            batch_size=50,
+            needs_dates=True,
+            date_columns=("round_date",)
+        ),
+        "Exit Scenarios": DatasetSpec(
+            VENTURE_CAPITAL_PROMPTS["exit_scenarios"],
+            batch_size=50,
+            needs_dates=True,
+            date_columns=("exit_date",)
+        )
+    }
     
     def generate_startup_profiles(
         self,
@@ -45,18 +51,7 @@ class VentureCapitalGenerator(BaseGenerator):
         **kwargs
     ) -> pd.DataFrame:
         """Generate startup profile data."""
-        
-        records = self._generate_in_batches(
-            VENTURE_CAPITAL_PROMPTS["startup_profiles"],
-            num_records,
-            batch_size=50
-        )
-        
-        records = self._validate_records(records)
-        df = self._to_dataframe(records)
-        df = self.add_metadata(df, is_synthetic=True, domain="venture_capital")
-        
-        return df
+        return self._run(self._DATASETS["Startup Profiles"], num_records, start_date, end_date)
     
     def generate_funding_rounds(
         self,
@@ -66,18 +61,7 @@ class VentureCapitalGenerator(BaseGenerator):
         **kwargs
     ) -> pd.DataFrame:
         """Generate funding round data."""
-        
-        records = self._generate_in_batches(
-            VENTURE_CAPITAL_PROMPTS["funding_rounds"],
-            num_records,
-            batch_size=50
-        )
-        
-        records = self._validate_records(records)
-        df = self._to_dataframe(records)
-        df = self.add_metadata(df, is_synthetic=True, domain="venture_capital")
-        
-        return df
+        return self._run(self._DATASETS["Funding Rounds"], num_records, start_date, end_date)
     
     def generate_cap_tables(
         self,
@@ -87,18 +71,7 @@ class VentureCapitalGenerator(BaseGenerator):
         **kwargs
     ) -> pd.DataFrame:
         """Generate cap table data."""
-        
-        records = self._generate_in_batches(
-            VENTURE_CAPITAL_PROMPTS["cap_tables"],
-            num_records,
-            batch_size=50
-        )
-        
-        records = self._validate_records(records)
-        df = self._to_dataframe(records)
-        df = self.add_metadata(df, is_synthetic=True, domain="venture_capital")
-        
-        return df
+        return self._run(self._DATASETS["Cap Tables"], num_records, start_date, end_date)
     
     def generate_investor_syndicates(
         self,
@@ -108,37 +81,7 @@ class VentureCapitalGenerator(BaseGenerator):
         **kwargs
     ) -> pd.DataFrame:
         """Generate investor syndicate data."""
-        
-        start_date, end_date = self.get_date_range(start_date, end_date)
-        
-        prompt = f"""Generate {num_records} investor syndicate records:
-        
-Required fields:
-- deal_name: Deal/company name
-- round_type: Round type (Seed, Series A, B, C, etc.)
-- round_date: Date between {start_date} and {end_date}
-- lead_investor: Lead investor name
-- co_investors: List of co-investor names (comma-separated)
-- total_investors: Total number of investors
-- lead_investment_mm: Lead investor amount in millions
-- total_round_mm: Total round size in millions
-- lead_ownership_pct: Lead investor ownership percentage
-
-Return as JSON array of objects."""
-        
-        records = self._generate_in_batches(
-            prompt,
-            num_records,
-            batch_size=50,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
-        records = self._validate_records(records)
-        df = self._to_dataframe(records)
-        df = self.add_metadata(df, is_synthetic=True, domain="venture_capital")
-        
-        return df
+        return self._run(self._DATASETS["Investor Syndicates"], num_records, start_date, end_date)
     
     def generate_exit_scenarios(
         self,
@@ -148,39 +91,4 @@ Return as JSON array of objects."""
         **kwargs
     ) -> pd.DataFrame:
         """Generate exit scenario data."""
-        
-        start_date, end_date = self.get_date_range(start_date, end_date)
-        
-        prompt = f"""Generate {num_records} startup exit records:
-        
-Required fields:
-- startup_name: Company name
-- exit_date: Exit date between {start_date} and {end_date}
-- exit_type: Type (IPO, Acquisition, Merger, Secondary Sale, Shutdown)
-- exit_valuation_mm: Exit valuation in millions
-- total_funding_mm: Total funding raised in millions
-- return_multiple: Multiple on invested capital
-- years_to_exit: Years from founding to exit
-- acquirer_name: Acquirer name (for acquisitions)
-- outcome: Outcome (Unicorn Exit, Successful, Modest, Failed)
-
-Constraints:
-- Successful exits typically 3-10 years
-- Return multiples 2x to 100x for successful, <1x for failed
-- IPO valuations typically $500M+
-
-Return as JSON array of objects."""
-        
-        records = self._generate_in_batches(
-            prompt,
-            num_records,
-            batch_size=50,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
-        records = self._validate_records(records)
-        df = self._to_dataframe(records)
-        df = self.add_metadata(df, is_synthetic=True, domain="venture_capital")
-        
-        return df
\ No newline at end of file
+        return self._run(self._DATASETS["Exit Scenarios"], num_records, start_date, end_date)
\ No newline at end of file
@@ -1,14 +1,28 @@
 """
 Google Gemini API client for LLM-based data generation.
 """
+import hashlib
 import json
+import random
+import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from loguru import logger
 from src.config.settings import settings
 from src.config.prompts import SYSTEM_PROMPT
 
+# Body of the first markdown code block, with or without a json language tag
+_JSON_FENCE = re.compile(r"```(?:json)?(.*?)(?:```|$)", re.S)
+
+# Upper bound in seconds for the jittered retry backoff
+RETRY_BACKOFF_CAP = 30.0
+
 
 class GeminiClient:
     """Client for interacting with Google Gemini API."""
@@ -18,7 +32,21 @@ class GeminiClient:
         self.api_key = settings.gemini_api_key
         self.model_name = settings.gemini_model
         self.rate_limit = settings.gemini_requests_per_minute
-        self.last_request_time = 0
+        # Start times (monotonic clock) of requests in the last minute, including
+        # slots reserved by callers that are still waiting
+        self._request_times = deque()
+        self._rate_lock = threading.Lock()
+        # After a 429 no new request starts before this time (monotonic clock)
+        self._blocked_until = 0.0
+        
+        # GenerationConfig per temperature; batches reuse one instead of
+        # building an identical config for every call
+        self._generation_configs = {}
+        
+        # On-disk cache of low-temperature responses, one text file per prompt
+        self._cache_dir = settings.output_dir / ".cache" / "responses"
+        # Cache hit/miss counters, updated under _rate_lock
+        self.stats = {"hits": 0, "misses": 0}
         
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
@@ -30,63 +58,156 @@ class GeminiClient:
         logger.info(f"Initialized Gemini client with model: {self.model_name}")
     
     def _rate_limit(self):
-        """Apply rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        min_interval = 60.0 / self.rate_limit
+        """
+        Apply rate limiting between requests (safe to call from several threads).
+        
+        A sliding one-minute window: requests go out immediately, in bursts,
+        until rate_limit of them have started within the last 60 seconds;
+        only then does a caller wait for the oldest one to age out.
+        """
+        # Reserve the next request slot under the lock but sleep outside it, so
+        # concurrent callers share one budget without serializing their requests
+        with self._rate_lock:
+            current_time = time.monotonic()
+            while self._request_times and self._request_times[0] <= current_time - 60:
+                self._request_times.popleft()
+            
+            slot_time = current_time
+            if len(self._request_times) >= self.rate_limit:
+                slot_time = self._request_times[-self.rate_limit] + 60
+            # Keep the window ordered behind slots already promised to waiters
+            if self._request_times:
+                slot_time = max(slot_time, self._request_times[-1])
+            slot_time = max(slot_time, self._blocked_until)
+            self._request_times.append(slot_time)
         
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
+        sleep_time = slot_time - current_time
+        if sleep_time > 0:
             logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
             time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+    
+    def _block_requests(self, delay: float):
+        """Hold back every caller's next request for delay seconds."""
+        with self._rate_lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+    
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Server-suggested retry delay (RetryInfo) of a 429 error, if any."""
+        for detail in getattr(error, "details", None) or ():
+            delay = getattr(detail, "retry_delay", None)
+            if delay is not None:
+                return delay.seconds + delay.nanos / 1e9
+        return None
+    
+    def _record_cache(self, outcome: str):
+        """Count a cache hit or miss (generate_batch calls this from worker threads)."""
+        with self._rate_lock:
+            self.stats[outcome] += 1
+    
+    def _cache_path(self, full_prompt: str, temperature: float) -> Path:
+        """Cache file for a model, temperature and prompt."""
+        key = hashlib.sha256(f"{self.model_name}|{temperature}|{full_prompt}".encode()).hexdigest()
+        return self._cache_dir / f"{key}.txt"
+    
+    def _read_cache(self, path: Path) -> Optional[str]:
+        """Return a cached response younger than settings.llm_cache_ttl."""
+        try:
+            if time.time() - path.stat().st_mtime < settings.llm_cache_ttl:
+                return path.read_text(encoding="utf-8")
+        except OSError:
+            pass
+        return None
+    
+    def _write_cache(self, path: Path, text: str):
+        """Store a response (failures are logged, never raised)."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary name first so readers never see a partial file
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not cache Gemini response: {str(e)}")
     
     def generate_text(
         self, 
         prompt: str, 
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
-        max_retries: int = 3
+        max_retries: int = 3,
+        use_cache: bool = True
     ) -> str:
         """
         Generate text using Gemini.
         
+        Responses to calls at or below settings.llm_cache_max_temperature are
+        near-deterministic, so they are cached on disk and reused.
+        
         Args:
             prompt: User prompt
             system_prompt: System prompt (uses default if None)
             temperature: Generation temperature (0.0 to 1.0)
             max_retries: Maximum number of retries on failure
+            use_cache: Whether a low-temperature call may use the cache
         
         Returns:
             Generated text
         """
-        self._rate_limit()
-        
         # Combine system and user prompts
         full_prompt = f"{system_prompt or SYSTEM_PROMPT}\n\n{prompt}"
         
+        cache_path = None
+        if use_cache and temperature <= settings.llm_cache_max_temperature:
+            cache_path = self._cache_path(full_prompt, temperature)
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                self._record_cache("hits")
+                logger.debug("Using cached Gemini response")
+                return cached
+            self._record_cache("misses")
+        
+        generation_config = self._generation_configs.get(temperature)
+        if generation_config is None:
+            generation_config = self._generation_configs.setdefault(
+                temperature,
+                genai.types.GenerationConfig(temperature=temperature)
+            )
+        
         for attempt in range(max_retries):
+            # Retries count against the rate limit too
+            self._rate_limit()
             try:
                 logger.debug(f"Generating text (attempt {attempt + 1}/{max_retries})")
                 
                 response = self.model.generate_content(
                     full_prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=temperature,
-                    )
+                    generation_config=generation_config
                 )
                 
                 if response.text:
                     logger.debug(f"Generated {len(response.text)} characters")
+                    if cache_path is not None:
+                        self._write_cache(cache_path, response.text)
                     return response.text
                 else:
                     logger.warning("Empty response from Gemini")
                     
+            except google_exceptions.TooManyRequests as e:
+                if attempt == max_retries - 1:
+                    raise
+                # Quota exhausted: every worker backs off, not just this one
+                delay = self._retry_after(e)
+                if delay is None:
+                    delay = random.uniform(0, min(RETRY_BACKOFF_CAP, 2 ** (attempt + 1)))
+                logger.warning(f"Gemini rate limit hit (attempt {attempt + 1}), retrying in {delay:.1f}s")
+                self._block_requests(delay)
             except Exception as e:
                 logger.error(f"Error generating text (attempt {attempt + 1}): {str(e)}")
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    # Exponential backoff with full jitter, so workers that
+                    # failed together do not all retry at the same moment
+                    time.sleep(random.uniform(0, min(RETRY_BACKOFF_CAP, 2 ** (attempt + 1))))
                 else:
                     raise
         
@@ -130,13 +251,10 @@ class GeminiClient:
         Returns:
             Parsed JSON data
         """
-        # Remove markdown code blocks if present
-        text = text.strip()
-        
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0].strip()
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0].strip()
+        # Remove markdown code blocks if present (an unclosed fence, as in a
+        # truncated response, runs to the end of the text)
+        fence = _JSON_FENCE.search(text)
+        text = fence.group(1).strip() if fence else text.strip()
         
         # Try to parse
         parsed = json.loads(text)
@@ -158,22 +276,25 @@ class GeminiClient:
         """
         Generate text for multiple prompts.
         
+        Prompts are sent concurrently (up to settings.gemini_max_concurrency
+        at once); _rate_limit keeps the combined rate within the RPM budget.
+        
         Args:
             prompts: List of prompts
             system_prompt: System prompt
             temperature: Generation temperature
         
         Returns:
-            List of generated texts
+            List of generated texts, in prompt order
         """
-        results = []
-        
-        for i, prompt in enumerate(prompts):
-            logger.info(f"Processing batch item {i + 1}/{len(prompts)}")
-            result = self.generate_text(prompt, system_prompt, temperature)
-            results.append(result)
+        logger.info(f"Processing {len(prompts)} batch items")
         
-        return results
+        max_workers = max(1, min(settings.gemini_max_concurrency, len(prompts)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda prompt: self.generate_text(prompt, system_prompt, temperature),
+                prompts
+            ))
     
     def test_connection(self) -> bool:
         """
@@ -183,7 +304,8 @@ class GeminiClient:
             True if connection successful
         """
         try:
-            response = self.generate_text("Say 'Hello'", temperature=0.1)
+            # Must reach the API, so never answered from the cache
+            response = self.generate_text("Say 'Hello'", temperature=0.1, use_cache=False)
             logger.info("Gemini API connection test successful")
             return True
         except Exception as e:
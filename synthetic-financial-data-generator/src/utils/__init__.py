@@ -1,6 +1,7 @@
 """Utilities module."""
 from src.utils.data_exporter import DataExporter
+from src.utils.dataset_cache import DatasetCache
 from src.utils.metrics_calculator import MetricsCalculator
 from src.utils.logger import setup_logger
 
-__all__ = ['DataExporter', 'MetricsCalculator', 'setup_logger']
\ No newline at end of file
+__all__ = ['DataExporter', 'DatasetCache', 'MetricsCalculator', 'setup_logger']
\ No newline at end of file
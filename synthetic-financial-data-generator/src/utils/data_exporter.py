@@ -1,12 +1,42 @@
 """
 Data export utilities for multiple formats.
 """
+import json
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
 from loguru import logger
 from src.config.settings import settings
 
+# XlsxWriter writes workbooks faster and with far less memory than openpyxl,
+# which builds a Python object for every cell first
+try:
+    import xlsxwriter  # noqa: F401
+    EXCEL_ENGINE = "xlsxwriter"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+# Buffer size for text exports: pandas writes CSV in many small chunks, and a
+# 1 MiB buffer coalesces them into far fewer write syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Rows serialized at a time, so large exports never hold the whole encoded
+# file in memory (CSV text chunks / Parquet row groups)
+CSV_CHUNK_ROWS = 8192
+PARQUET_ROW_GROUP_ROWS = 65536
+
+
+def _json_default(value):
+    """Encode NumPy scalars as their Python value and anything else as text."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
 
 class DataExporter:
     """Export datasets to various formats."""
@@ -66,16 +96,65 @@ class DataExporter:
     ) -> Path:
         """Export to CSV format."""
         filepath = self.output_dir / f"{filename}.csv"
+        encoding = kwargs.get('encoding', 'utf-8')
+        index = kwargs.get('index', False)
         
-        df.to_csv(
+        # Arrow's C++ writer only emits UTF-8 and has no index column; other
+        # requests, and frames Arrow cannot convert, go through pandas
+        if not index and encoding.lower().replace('-', '') == 'utf8':
+            try:
+                pv.write_csv(
+                    self._to_csv_table(df),
+                    filepath,
+                    write_options=pv.WriteOptions(batch_size=CSV_CHUNK_ROWS)
+                )
+                logger.info(f"Exported CSV: {filepath}")
+                return filepath
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                logger.debug("Arrow CSV writer failed ({}), using pandas", e)
+        
+        with open(
             filepath,
-            index=kwargs.get('index', False),
-            encoding=kwargs.get('encoding', 'utf-8')
-        )
+            "w",
+            encoding=encoding,
+            newline="",
+            buffering=WRITE_BUFFER_SIZE
+        ) as f:
+            df.to_csv(f, index=index, chunksize=CSV_CHUNK_ROWS)
         
         logger.info(f"Exported CSV: {filepath}")
         return filepath
     
+    @staticmethod
+    def _to_csv_table(df: pd.DataFrame) -> pa.Table:
+        """
+        Convert a DataFrame to an Arrow table for the CSV writer.
+        
+        Naive timestamps are narrowed to the coarsest unit that loses
+        nothing (date, seconds, milliseconds, microseconds), so they are
+        written as pandas writes them (2024-01-31, 10:00:00.500) rather
+        than with a nanosecond time part.
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
+        for i, field in enumerate(table.schema):
+            if not pa.types.is_timestamp(field.type) or field.type.tz:
+                continue
+            column = table.column(i)
+            for unit, target in (
+                ("day", pa.date32()),
+                ("second", pa.timestamp('s')),
+                ("millisecond", pa.timestamp('ms')),
+                ("microsecond", pa.timestamp('us'))
+            ):
+                # Arrow casts truncate silently, so check nothing is cut off
+                floored = pc.floor_temporal(column, unit=unit)
+                if pc.all(pc.equal(floored, column)).as_py() is not False:
+                    table = table.set_column(i, field.name, floored.cast(target))
+                    break
+        
+        return table
+    
     def to_json(
         self,
         df: pd.DataFrame,
@@ -122,13 +201,25 @@ class DataExporter:
     ) -> Path:
         """Export to Parquet format."""
         filepath = self.output_dir / f"{filename}.parquet"
+        preserve_index = kwargs.get('index', False)
+        row_group_rows = kwargs.get('row_group_size', PARQUET_ROW_GROUP_ROWS)
         
-        df.to_parquet(
+        # Convert and write one row group at a time against a shared schema.
+        # The string-heavy datasets compress well with dictionary pages, and
+        # zstd beats snappy on size at similar write cost
+        schema = pa.Schema.from_pandas(df, preserve_index=preserve_index)
+        with pq.ParquetWriter(
             filepath,
-            engine=kwargs.get('engine', 'pyarrow'),
-            compression=kwargs.get('compression', 'snappy'),
-            index=kwargs.get('index', False)
-        )
+            schema,
+            compression=kwargs.get('compression', 'zstd'),
+            use_dictionary=True,
+            write_statistics=True
+        ) as writer:
+            for start in range(0, len(df), row_group_rows):
+                chunk = df.iloc[start:start + row_group_rows]
+                writer.write_table(
+                    pa.Table.from_pandas(chunk, schema=schema, preserve_index=preserve_index)
+                )
         
         logger.info(f"Exported Parquet: {filepath}")
         return filepath
@@ -142,7 +233,7 @@ class DataExporter:
         """Export to Excel format."""
         filepath = self.output_dir / f"{filename}.xlsx"
         
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        with pd.ExcelWriter(filepath, engine=EXCEL_ENGINE) as writer:
             df.to_excel(
                 writer,
                 sheet_name=kwargs.get('sheet_name', 'Data'),
@@ -151,7 +242,7 @@ class DataExporter:
             
             # Add data dictionary sheet if requested
             if kwargs.get('include_dictionary', True):
-                data_dict = self._create_data_dictionary(df)
+                data_dict = self._create_data_dictionary(df, kwargs.get('metrics'))
                 data_dict.to_excel(
                     writer,
                     sheet_name='Data Dictionary',
@@ -161,30 +252,47 @@ class DataExporter:
         logger.info(f"Exported Excel: {filepath}")
         return filepath
     
-    def _create_data_dictionary(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _create_data_dictionary(
+        self,
+        df: pd.DataFrame,
+        metrics: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
         """
         Create data dictionary for DataFrame.
         
         Args:
             df: DataFrame
+            metrics: Output of MetricsCalculator.calculate_all_metrics; its
+                null and unique counts are reused for the columns it covers
         
         Returns:
             Data dictionary DataFrame
         """
-        dictionary = []
+        completeness = (metrics or {}).get('completeness', {}).get('by_column', {})
+        uniqueness = (metrics or {}).get('uniqueness', {}).get('by_column', {})
         
+        # Frame-wide reductions, over only the columns the metrics lack
+        missing = [col for col in df.columns if col not in completeness or col not in uniqueness]
+        null_counts = dict(zip(missing, (len(df) - df[missing].count()).tolist()))
+        unique_counts = dict(zip(missing, df[missing].nunique().tolist()))
         for col in df.columns:
-            col_data = {
-                'Column Name': col,
-                'Data Type': str(df[col].dtype),
-                'Non-Null Count': df[col].count(),
-                'Null Count': df[col].isnull().sum(),
-                'Unique Values': df[col].nunique(),
-                'Sample Values': ', '.join(map(str, df[col].dropna().head(3).tolist()))
-            }
-            dictionary.append(col_data)
-        
-        return pd.DataFrame(dictionary)
+            if col not in null_counts:
+                null_counts[col] = completeness[col]['null_count']
+                unique_counts[col] = uniqueness[col]['unique_count']
+        
+        nulls = [null_counts[col] for col in df.columns]
+        
+        return pd.DataFrame({
+            'Column Name': df.columns,
+            'Data Type': df.dtypes.astype(str).to_numpy(),
+            'Non-Null Count': [len(df) - n for n in nulls],
+            'Null Count': nulls,
+            'Unique Values': [unique_counts[col] for col in df.columns],
+            'Sample Values': [
+                ', '.join(map(str, series.dropna().head(3).tolist()))
+                for _, series in df.items()
+            ]
+        })
     
     def export_with_metadata(
         self,
@@ -212,7 +320,10 @@ class DataExporter:
         
         # Export metadata
         metadata_path = self.output_dir / f"{filename}_metadata.json"
-        pd.Series(metadata).to_json(metadata_path, indent=2)
+        metadata_path.write_text(
+            json.dumps(metadata, indent=2, default=_json_default),
+            encoding="utf-8"
+        )
         
         logger.info(f"Exported metadata: {metadata_path}")
         return filepath
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+On-disk cache of generated datasets, stored as Feather files.
+"""
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+import pandas as pd
+from loguru import logger
+from src.config.prompts import SYSTEM_PROMPT
+from src.config.settings import settings
+
+# Bump whenever the generators change the columns or dtypes of the frames they
+# return, so files written by an older build are never replayed
+CACHE_FORMAT_VERSION = 1
+
+
+class DatasetCache:
+    """Reuse a previously generated dataset for an identical request."""
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize dataset cache.
+        
+        Args:
+            cache_dir: Cache directory (uses <output_dir>/.cache if None)
+        """
+        self.cache_dir = cache_dir or settings.output_dir / ".cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"DatasetCache initialized with cache dir: {self.cache_dir}")
+    
+    def _path(
+        self,
+        domain: str,
+        dataset_type: str,
+        prompt_template: str,
+        num_records: int,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> Path:
+        """Content-addressed file path for a generation request."""
+        # The prompts and model that produce the data are part of the key, so
+        # editing a prompt or switching models never serves stale datasets
+        request = "|".join(map(str, (
+            domain, dataset_type, num_records, start_date, end_date,
+            settings.gemini_model, CACHE_FORMAT_VERSION
+        )))
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (request, SYSTEM_PROMPT, prompt_template):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return self.cache_dir / f"{digest.hexdigest()}.feather"
+    
+    def get(
+        self,
+        domain: str,
+        dataset_type: str,
+        prompt_template: str,
+        num_records: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load a cached dataset.
+        
+        Args:
+            domain: Financial domain
+            dataset_type: Type of dataset
+            prompt_template: Template the generator uses for the dataset
+            num_records: Number of records
+            start_date: Start date for time-series data
+            end_date: End date for time-series data
+        
+        Returns:
+            Cached DataFrame, or None on a miss
+        """
+        path = self._path(domain, dataset_type, prompt_template, num_records, start_date, end_date)
+        if not path.exists():
+            return None
+        
+        try:
+            df = pd.read_feather(path, use_threads=True)
+            logger.info(f"Loaded {len(df)} cached records from {path.name}")
+            return df
+        except Exception as e:
+            logger.warning(f"Could not read cached dataset {path.name}: {str(e)}")
+            return None
+    
+    def put(
+        self,
+        df: pd.DataFrame,
+        domain: str,
+        dataset_type: str,
+        prompt_template: str,
+        num_records: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ):
+        """Store a generated dataset (failures are logged, never raised)."""
+        path = self._path(domain, dataset_type, prompt_template, num_records, start_date, end_date)
+        # Write to a temporary name first so concurrent jobs never interleave
+        # writes and readers never see a partial file
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        
+        try:
+            df.reset_index(drop=True).to_feather(tmp_path, compression="lz4")
+            tmp_path.replace(path)
+            logger.debug(f"Cached dataset as {path.name}")
+        except Exception as e:
+            # e.g. mixed-type object columns that Arrow cannot store
+            logger.warning(f"Could not cache dataset: {str(e)}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def clear(self):
+        """Delete all cached datasets."""
+        for path in self.cache_dir.glob("*.feather"):
+            path.unlink(missing_ok=True)
@@ -1,11 +1,17 @@
 """
 Calculate data quality metrics for generated datasets.
 """
-from typing import Dict, Any
+import heapq
+import warnings
+from typing import Dict, Any, Optional
 import pandas as pd
 import numpy as np
 from loguru import logger
 
+# Rows sampled to estimate the size of object columns; walking every Python
+# object with deep=True dominates metrics time on large frames
+MEMORY_SAMPLE_ROWS = 1000
+
 
 class MetricsCalculator:
     """Calculate comprehensive data quality metrics."""
@@ -22,12 +28,16 @@ class MetricsCalculator:
         """
         logger.info(f"Calculating metrics for DataFrame with shape {df.shape}")
         
+        # Classify dtypes once; select_dtypes copies the selected columns, so
+        # validity and distributions share a single numeric sub-frame
+        num_df = df.select_dtypes(include='number')
+        
         metrics = {
             'basic': self.calculate_basic_metrics(df),
             'completeness': self.calculate_completeness(df),
             'uniqueness': self.calculate_uniqueness(df),
-            'validity': self.calculate_validity(df),
-            'distribution': self.calculate_distributions(df)
+            'validity': self.calculate_validity(df, num_df),
+            'distribution': self.calculate_distributions(df, num_df)
         }
         
         return metrics
@@ -37,23 +47,38 @@ class MetricsCalculator:
         return {
             'total_records': len(df),
             'total_columns': len(df.columns),
-            'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
+            'memory_usage_mb': self._estimate_memory_bytes(df) / 1024 / 1024,
             'columns': df.columns.tolist()
         }
     
+    def _estimate_memory_bytes(self, df: pd.DataFrame) -> int:
+        """Deep memory usage, sampling object columns on large frames."""
+        obj_df = df.select_dtypes(include='object')
+        if len(obj_df.columns) == 0 or len(df) <= MEMORY_SAMPLE_ROWS:
+            return int(df.memory_usage(deep=True).sum())
+        
+        # Fixed-width columns and the index are measured exactly
+        exact = df.select_dtypes(exclude='object').memory_usage(deep=True).sum()
+        sample = obj_df.sample(MEMORY_SAMPLE_ROWS, random_state=0)
+        per_row = sample.memory_usage(deep=True, index=False).sum() / MEMORY_SAMPLE_ROWS
+        return int(exact + per_row * len(df))
+    
     def calculate_completeness(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate data completeness metrics."""
         total_cells = df.shape[0] * df.shape[1]
-        null_cells = df.isnull().sum().sum()
-        
-        completeness_by_column = {}
-        for col in df.columns:
-            non_null = df[col].count()
-            total = len(df)
-            completeness_by_column[col] = {
-                'completeness_pct': round((non_null / total) * 100, 2) if total > 0 else 0,
-                'null_count': total - non_null
+        total = len(df)
+        
+        # One reduction over the whole frame instead of one count() per column
+        null_counts = df.isnull().sum()
+        null_cells = null_counts.sum()
+        
+        completeness_by_column = {
+            col: {
+                'completeness_pct': round((1 - nulls / total) * 100, 2) if total > 0 else 0,
+                'null_count': int(nulls)
             }
+            for col, nulls in zip(df.columns, null_counts.to_numpy())
+        }
         
         return {
             'overall_completeness_pct': round(((total_cells - null_cells) / total_cells) * 100, 2) if total_cells > 0 else 0,
@@ -63,55 +88,77 @@ class MetricsCalculator:
     
     def calculate_uniqueness(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate uniqueness metrics."""
-        uniqueness_by_column = {}
+        total = len(df)
+        unique_counts = df.nunique()
         
-        for col in df.columns:
-            total = len(df)
-            unique = df[col].nunique()
-            duplicate_count = total - unique
-            
-            uniqueness_by_column[col] = {
+        uniqueness_by_column = {
+            col: {
                 'unique_count': int(unique),
-                'duplicate_count': int(duplicate_count),
+                'duplicate_count': int(total - unique),
                 'uniqueness_pct': round((unique / total) * 100, 2) if total > 0 else 0
             }
+            for col, unique in zip(df.columns, unique_counts.to_numpy())
+        }
         
         return {
             'by_column': uniqueness_by_column,
             'duplicate_rows': int(df.duplicated().sum())
         }
     
-    def calculate_validity(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Calculate validity metrics."""
+    def calculate_validity(
+        self,
+        df: pd.DataFrame,
+        num_df: Optional[pd.DataFrame] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate validity metrics.
+        
+        Args:
+            df: DataFrame to analyze
+            num_df: df's numeric columns, if already selected
+        
+        Returns:
+            Dictionary of validity metrics
+        """
         validity_by_column = {}
+        non_null = df.count()
         
-        for col in df.columns:
-            col_data = df[col].dropna()
+        # For numeric columns, check for outliers: quartiles and the IQR mask
+        # are computed for all columns at once rather than column by column
+        if num_df is None:
+            num_df = df.select_dtypes(include='number')
+        outliers = {}
+        if len(num_df.columns) > 0:
+            arr = num_df.to_numpy(dtype=float, na_value=np.nan)
+            with warnings.catch_warnings():
+                # All-null columns yield NaN bounds and are reported as empty below
+                warnings.simplefilter("ignore", RuntimeWarning)
+                q1, q3 = np.nanquantile(arr, [0.25, 0.75], axis=0)
+            iqr = q3 - q1
+            lower_bound = q1 - 3 * iqr
+            upper_bound = q3 + 3 * iqr
             
-            if len(col_data) == 0:
+            # NaN compares False on both sides, so missing values never count
+            counts = ((arr < lower_bound) | (arr > upper_bound)).sum(axis=0)
+            outliers = dict(zip(num_df.columns, counts.tolist()))
+        
+        for col, dtype, valid in zip(df.columns, df.dtypes, non_null.to_numpy()):
+            if valid == 0:
                 validity_by_column[col] = {
-                    'data_type': str(df[col].dtype),
+                    'data_type': str(dtype),
                     'valid_pct': 0
                 }
                 continue
             
             # Check for valid ranges based on data type
             validity_info = {
-                'data_type': str(df[col].dtype),
+                'data_type': str(dtype),
                 'valid_pct': 100.0  # Assume valid unless we detect issues
             }
             
-            # For numeric columns, check for outliers
-            if pd.api.types.is_numeric_dtype(df[col]):
-                q1 = col_data.quantile(0.25)
-                q3 = col_data.quantile(0.75)
-                iqr = q3 - q1
-                lower_bound = q1 - 3 * iqr
-                upper_bound = q3 + 3 * iqr
-                
-                outliers = ((col_data < lower_bound) | (col_data > upper_bound)).sum()
-                validity_info['outlier_count'] = int(outliers)
-                validity_info['outlier_pct'] = round((outliers / len(col_data)) * 100, 2)
+            if col in outliers:
+                validity_info['outlier_count'] = int(outliers[col])
+                validity_info['outlier_pct'] = round((outliers[col] / valid) * 100, 2)
             
             validity_by_column[col] = validity_info
         
@@ -119,38 +166,74 @@ class MetricsCalculator:
             'by_column': validity_by_column
         }
     
-    def calculate_distributions(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Calculate distribution statistics."""
+    def calculate_distributions(
+        self,
+        df: pd.DataFrame,
+        num_df: Optional[pd.DataFrame] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate distribution statistics.
+        
+        Args:
+            df: DataFrame to analyze
+            num_df: df's numeric columns, if already selected
+        
+        Returns:
+            Dictionary of per-column distribution statistics
+        """
         distributions = {}
         
-        for col in df.columns:
-            col_data = df[col].dropna()
-            
-            if len(col_data) == 0:
-                continue
-            
-            if pd.api.types.is_numeric_dtype(df[col]):
-                distributions[col] = {
-                    'mean': float(col_data.mean()),
-                    'median': float(col_data.median()),
-                    'std': float(col_data.std()) if len(col_data) > 1 else 0,
-                    'min': float(col_data.min()),
-                    'max': float(col_data.max()),
-                    'q25': float(col_data.quantile(0.25)),
-                    'q75': float(col_data.quantile(0.75))
+        # One describe() pass covers every numeric statistic for all columns
+        if num_df is None:
+            num_df = df.select_dtypes(include='number')
+        num_stats = {}
+        if len(num_df.columns) > 0:
+            desc = num_df.describe(percentiles=[.25, .5, .75]).T
+            for col, row in zip(desc.index, desc.itertuples(index=False)):
+                count, mean, std, min_, q25, median, q75, max_ = row
+                if count == 0:
+                    continue
+                num_stats[col] = {
+                    'mean': float(mean),
+                    'median': float(median),
+                    'std': float(std) if count > 1 else 0,
+                    'min': float(min_),
+                    'max': float(max_),
+                    'q25': float(q25),
+                    'q75': float(q75)
                 }
-            elif pd.api.types.is_datetime64_any_dtype(df[col]):
-                distributions[col] = {
-                    'min_date': str(col_data.min()),
-                    'max_date': str(col_data.max()),
-                    'date_range_days': (col_data.max() - col_data.min()).days
+        
+        date_df = df.select_dtypes(include=['datetime', 'datetimetz'])
+        date_stats = {}
+        if len(date_df.columns) > 0:
+            bounds = date_df.agg(['min', 'max'])
+            for col in date_df.columns:
+                min_date, max_date = bounds.at['min', col], bounds.at['max', col]
+                if pd.isnull(min_date):
+                    continue
+                date_stats[col] = {
+                    'min_date': str(min_date),
+                    'max_date': str(max_date),
+                    'date_range_days': (max_date - min_date).days
                 }
+        
+        typed_cols = set(num_df.columns).union(date_df.columns)
+        for col, series in df.items():
+            if col in num_stats:
+                distributions[col] = num_stats[col]
+            elif col in date_stats:
+                distributions[col] = date_stats[col]
+            elif col in typed_cols:
+                continue  # all values missing
             else:
-                # Categorical
-                value_counts = col_data.value_counts()
+                # Categorical; value_counts() already drops nulls and its
+                # non-zero entries give the unique count without nunique()
+                value_counts = series.value_counts()
+                if value_counts.empty or value_counts.iat[0] == 0:
+                    continue
                 distributions[col] = {
                     'top_values': value_counts.head(5).to_dict(),
-                    'unique_count': int(col_data.nunique())
+                    'unique_count': int((value_counts > 0).sum())
                 }
         
         return distributions
@@ -165,60 +248,66 @@ class MetricsCalculator:
         Returns:
             HTML string
         """
-        html = "<div style='padding: 10px;'>"
-        html += "<h3>📊 Data Quality Metrics</h3>"
+        # Collect fragments and join once rather than growing a string
+        parts = ["<div style='padding: 10px;'>", "<h3>📊 Data Quality Metrics</h3>"]
         
         # Basic metrics
         basic = metrics.get('basic', {})
-        html += "<div style='background-color: #f0f8ff; padding: 10px; margin: 10px 0; border-radius: 5px;'>"
-        html += "<h4>Basic Information</h4>"
-        html += f"<p><strong>Total Records:</strong> {basic.get('total_records', 0):,}</p>"
-        html += f"<p><strong>Total Columns:</strong> {basic.get('total_columns', 0)}</p>"
-        html += f"<p><strong>Memory Usage:</strong> {basic.get('memory_usage_mb', 0):.2f} MB</p>"
-        html += "</div>"
+        parts.append("<div style='background-color: #f0f8ff; padding: 10px; margin: 10px 0; border-radius: 5px;'>")
+        parts.append("<h4>Basic Information</h4>")
+        parts.append(f"<p><strong>Total Records:</strong> {basic.get('total_records', 0):,}</p>")
+        parts.append(f"<p><strong>Total Columns:</strong> {basic.get('total_columns', 0)}</p>")
+        parts.append(f"<p><strong>Memory Usage:</strong> {basic.get('memory_usage_mb', 0):.2f} MB</p>")
+        parts.append("</div>")
         
         # Completeness
         completeness = metrics.get('completeness', {})
-        html += "<div style='background-color: #f0fff0; padding: 10px; margin: 10px 0; border-radius: 5px;'>"
-        html += "<h4>Completeness</h4>"
-        html += f"<p><strong>Overall Completeness:</strong> {completeness.get('overall_completeness_pct', 0):.2f}%</p>"
-        html += f"<p><strong>Total Null Cells:</strong> {completeness.get('total_null_cells', 0):,}</p>"
+        parts.append("<div style='background-color: #f0fff0; padding: 10px; margin: 10px 0; border-radius: 5px;'>")
+        parts.append("<h4>Completeness</h4>")
+        parts.append(f"<p><strong>Overall Completeness:</strong> {completeness.get('overall_completeness_pct', 0):.2f}%</p>")
+        parts.append(f"<p><strong>Total Null Cells:</strong> {completeness.get('total_null_cells', 0):,}</p>")
         
-        # Show worst columns for completeness
+        # Show worst columns for completeness (only the 5 lowest are needed,
+        # so select them without sorting every column)
         by_col = completeness.get('by_column', {})
         if by_col:
-            sorted_cols = sorted(by_col.items(), key=lambda x: x[1]['completeness_pct'])
-            html += "<p><strong>Columns with Missing Data:</strong></p><ul>"
-            for col, info in sorted_cols[:5]:
-                if info['null_count'] > 0:
-                    html += f"<li>{col}: {info['completeness_pct']:.1f}% complete ({info['null_count']} nulls)</li>"
-            html += "</ul>"
-        html += "</div>"
+            worst_cols = heapq.nsmallest(5, by_col.items(), key=lambda x: x[1]['completeness_pct'])
+            parts.append("<p><strong>Columns with Missing Data:</strong></p><ul>")
+            parts.extend(
+                f"<li>{col}: {info['completeness_pct']:.1f}% complete ({info['null_count']} nulls)</li>"
+                for col, info in worst_cols
+                if info['null_count'] > 0
+            )
+            parts.append("</ul>")
+        parts.append("</div>")
         
         # Uniqueness
         uniqueness = metrics.get('uniqueness', {})
-        html += "<div style='background-color: #fff0f5; padding: 10px; margin: 10px 0; border-radius: 5px;'>"
-        html += "<h4>Uniqueness</h4>"
-        html += f"<p><strong>Duplicate Rows:</strong> {uniqueness.get('duplicate_rows', 0):,}</p>"
-        html += "</div>"
+        parts.append("<div style='background-color: #fff0f5; padding: 10px; margin: 10px 0; border-radius: 5px;'>")
+        parts.append("<h4>Uniqueness</h4>")
+        parts.append(f"<p><strong>Duplicate Rows:</strong> {uniqueness.get('duplicate_rows', 0):,}</p>")
+        parts.append("</div>")
         
         # Validity
         validity = metrics.get('validity', {})
-        html += "<div style='background-color: #fffacd; padding: 10px; margin: 10px 0; border-radius: 5px;'>"
-        html += "<h4>Validity</h4>"
+        parts.append("<div style='background-color: #fffacd; padding: 10px; margin: 10px 0; border-radius: 5px;'>")
+        parts.append("<h4>Validity</h4>")
         
         by_col_validity = validity.get('by_column', {})
-        outlier_cols = {k: v for k, v in by_col_validity.items() if 'outlier_count' in v and v['outlier_count'] > 0}
+        outlier_items = [
+            f"<li>{col}: {info['outlier_count']} outliers ({info['outlier_pct']:.1f}%)</li>"
+            for col, info in by_col_validity.items()
+            if info.get('outlier_count', 0) > 0
+        ]
         
-        if outlier_cols:
-            html += "<p><strong>Columns with Outliers:</strong></p><ul>"
-            for col, info in outlier_cols.items():
-                html += f"<li>{col}: {info['outlier_count']} outliers ({info['outlier_pct']:.1f}%)</li>"
-            html += "</ul>"
+        if outlier_items:
+            parts.append("<p><strong>Columns with Outliers:</strong></p><ul>")
+            parts.extend(outlier_items)
+            parts.append("</ul>")
         else:
-            html += "<p>✅ No significant outliers detected</p>"
+            parts.append("<p>✅ No significant outliers detected</p>")
         
-        html += "</div>"
+        parts.append("</div>")
         
-        html += "</div>"
-        return html
\ No newline at end of file
+        parts.append("</div>")
+        return "".join(parts)
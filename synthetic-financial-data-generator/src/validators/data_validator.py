@@ -1,11 +1,17 @@
 """
 Data quality validator.
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from loguru import logger
 from src.config.settings import QUALITY_THRESHOLDS
 
+# Column classifications remembered per validator (oldest schema evicted first)
+SCHEMA_CACHE_SIZE = 32
+
 
 class DataValidator:
     """Validate data quality and consistency."""
@@ -13,6 +19,9 @@ class DataValidator:
     def __init__(self):
         """Initialize validator."""
         self.thresholds = QUALITY_THRESHOLDS
+        # tuple(df.columns) -> _classify_columns result; roles depend only on
+        # the names, so repeat validations of one schema skip the name scan
+        self._schema_cache: Dict[Tuple[Any, ...], Dict[str, List[str]]] = {}
         logger.info("DataValidator initialized")
     
     def validate(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -34,6 +43,23 @@ class DataValidator:
             'summary': {}
         }
         
+        # Nothing to check: an empty dataset fails outright, as it already did
+        # through the completeness check (score 0)
+        if df.empty:
+            results['passed'] = False
+            results['issues'].append("Dataset is empty")
+            results['summary'] = {'total_checks': 0, 'passed_checks': 0, 'total_issues': 1}
+            logger.info(f"Validation complete: {results['summary']}")
+            return results
+        
+        # Column roles are derived from the names once and shared by the checks
+        schema = tuple(df.columns)
+        columns = self._schema_cache.get(schema)
+        if columns is None:
+            if len(self._schema_cache) >= SCHEMA_CACHE_SIZE:
+                self._schema_cache.pop(next(iter(self._schema_cache)))
+            columns = self._schema_cache[schema] = self._classify_columns(df)
+        
         # Completeness check
         completeness_result = self.check_completeness(df)
         results['checks'].append(completeness_result)
@@ -42,14 +68,14 @@ class DataValidator:
             results['issues'].extend(completeness_result.get('issues', []))
         
         # Uniqueness check
-        uniqueness_result = self.check_uniqueness(df)
+        uniqueness_result = self.check_uniqueness(df, columns)
         results['checks'].append(uniqueness_result)
         if not uniqueness_result['passed']:
             results['passed'] = False
             results['issues'].extend(uniqueness_result.get('issues', []))
         
         # Data type consistency
-        dtype_result = self.check_data_types(df)
+        dtype_result = self.check_data_types(df, columns)
         results['checks'].append(dtype_result)
         
         # Summary
@@ -62,10 +88,63 @@ class DataValidator:
         logger.info(f"Validation complete: {results['summary']}")
         return results
     
+    def _classify_columns(self, df: pd.DataFrame) -> Dict[str, List[str]]:
+        """
+        Group columns by the role their names suggest.
+        
+        Args:
+            df: DataFrame to inspect
+        
+        Returns:
+            Dictionary with 'id', 'numeric_expected' and 'date_expected'
+            column lists, each in DataFrame column order
+        """
+        names = df.columns.astype(str).str.lower()
+        
+        id_mask = names.str.contains('id', regex=False) | names.str.endswith('_number')
+        numeric_mask = names.str.contains('amount|price|value', regex=True)
+        date_mask = names.str.contains('date', regex=False)
+        
+        return {
+            'id': df.columns[id_mask].tolist(),
+            'numeric_expected': df.columns[numeric_mask].tolist(),
+            'date_expected': df.columns[date_mask].tolist()
+        }
+    
+    def _null_counts(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Count nulls per column without building a boolean frame for numeric data.
+        
+        NumPy float columns are counted with one np.isnan pass over their
+        values and NumPy integer/bool columns cannot hold nulls; all other
+        columns go through isnull().
+        
+        Args:
+            df: DataFrame to inspect
+        
+        Returns:
+            Null count per column, in column order
+        """
+        kinds = np.array([dtype.kind if isinstance(dtype, np.dtype) else 'O' for dtype in df.dtypes])
+        counts = np.zeros(len(kinds), dtype=np.int64)
+        
+        float_pos = np.flatnonzero(kinds == 'f')
+        if len(float_pos) > 0:
+            values = df.iloc[:, float_pos].to_numpy()
+            counts[float_pos] = np.count_nonzero(np.isnan(values), axis=0)
+        
+        other_pos = np.flatnonzero(~np.isin(kinds, ['f', 'i', 'u', 'b']))
+        if len(other_pos) > 0:
+            counts[other_pos] = df.iloc[:, other_pos].isnull().sum().to_numpy()
+        
+        return pd.Series(counts, index=df.columns)
+    
     def check_completeness(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Check data completeness."""
         total_cells = df.shape[0] * df.shape[1]
-        null_cells = df.isnull().sum().sum()
+        # Per-column null counts from one pass serve both the score and the issues
+        null_counts = self._null_counts(df)
+        null_cells = null_counts.sum()
         completeness = (total_cells - null_cells) / total_cells if total_cells > 0 else 0
         
         threshold = self.thresholds['completeness']
@@ -74,10 +153,11 @@ class DataValidator:
         issues = []
         if not passed:
             # Find columns with high null rates
-            for col in df.columns:
-                null_pct = df[col].isnull().sum() / len(df)
-                if null_pct > (1 - threshold):
-                    issues.append(f"Column '{col}' has {null_pct*100:.1f}% null values")
+            null_pcts = null_counts / len(df)
+            issues = [
+                f"Column '{col}' has {null_pct*100:.1f}% null values"
+                for col, null_pct in null_pcts[null_pcts > (1 - threshold)].items()
+            ]
         
         return {
             'check': 'Completeness',
@@ -87,16 +167,25 @@ class DataValidator:
             'issues': issues
         }
     
-    def check_uniqueness(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Check uniqueness where expected."""
+    def check_uniqueness(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        """Check uniqueness where expected (columns: from _classify_columns)."""
         # Identify potential ID columns
-        id_columns = [col for col in df.columns if 'id' in col.lower() or col.lower().endswith('_number')]
+        id_columns = (columns or self._classify_columns(df))['id']
         
         passed = True
         issues = []
         
         for col in id_columns:
-            uniqueness = df[col].nunique() / len(df) if len(df) > 0 else 0
+            # Clean ID columns pass on pandas' hash-table uniqueness check
+            # without building the array of unique values
+            if len(df) > 0 and df[col].is_unique and not df[col].hasnans:
+                continue
+            
+            uniqueness = self._count_distinct(df[col]) / len(df) if len(df) > 0 else 0
             threshold = self.thresholds['uniqueness']
             
             if uniqueness < threshold:
@@ -109,20 +198,34 @@ class DataValidator:
             'issues': issues
         }
     
-    def check_data_types(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Check data type consistency."""
+    def _count_distinct(self, values: pd.Series) -> int:
+        """Non-null distinct values, counted by Arrow for Arrow-backed columns."""
+        if isinstance(values.array, pd.arrays.ArrowExtensionArray):
+            # Hashes the packed buffers in C++ instead of one object at a time
+            return pc.count_distinct(pa.array(values.array)).as_py()
+        return values.nunique()
+    
+    def check_data_types(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        """Check data type consistency (columns: from _classify_columns)."""
         issues = []
+        columns = columns or self._classify_columns(df)
+        numeric_expected = set(columns['numeric_expected'])
+        date_expected = set(columns['date_expected'])
         
-        for col in df.columns:
+        # Classify by dtype kind from one df.dtypes read ('b' included, as
+        # is_numeric_dtype counts booleans as numeric)
+        for col, dtype in zip(df.columns, df.dtypes):
             # Check if numeric columns have non-numeric values
-            if 'amount' in col.lower() or 'price' in col.lower() or 'value' in col.lower():
-                if not pd.api.types.is_numeric_dtype(df[col]):
-                    issues.append(f"Column '{col}' should be numeric but is {df[col].dtype}")
+            if col in numeric_expected and dtype.kind not in 'biufc':
+                issues.append(f"Column '{col}' should be numeric but is {dtype}")
             
             # Check if date columns are datetime
-            if 'date' in col.lower():
-                if not pd.api.types.is_datetime64_any_dtype(df[col]):
-                    issues.append(f"Column '{col}' should be datetime but is {df[col].dtype}")
+            if col in date_expected and dtype.kind != 'M':
+                issues.append(f"Column '{col}' should be datetime but is {dtype}")
         
         return {
             'check': 'Data Types',
@@ -134,21 +237,25 @@ class DataValidator:
         """Find data anomalies."""
         anomalies = []
         
-        for col in df.columns:
-            if pd.api.types.is_numeric_dtype(df[col]):
-                # Check for outliers using IQR method
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                
-                outliers = df[(df[col] < Q1 - 3*IQR) | (df[col] > Q3 + 3*IQR)]
-                
-                if len(outliers) > 0:
-                    anomalies.append({
-                        'column': col,
-                        'type': 'outliers',
-                        'count': len(outliers),
-                        'percentage': len(outliers) / len(df) * 100
-                    })
-        
-        return anomalies
\ No newline at end of file
+        # Check for outliers using IQR method: quartiles for every numeric
+        # column from one quantile call, then one broadcast comparison
+        num_df = df.select_dtypes(include='number')
+        if len(num_df.columns) == 0:
+            return anomalies
+        
+        quartiles = num_df.quantile([0.25, 0.75])
+        Q1, Q3 = quartiles.iloc[0], quartiles.iloc[1]
+        IQR = Q3 - Q1
+        
+        outlier_counts = (num_df.lt(Q1 - 3*IQR, axis=1) | num_df.gt(Q3 + 3*IQR, axis=1)).sum()
+        
+        for col, count in outlier_counts[outlier_counts > 0].items():
+            count = int(count)
+            anomalies.append({
+                'column': col,
+                'type': 'outliers',
+                'count': count,
+                'percentage': count / len(df) * 100
+            })
+        
+        return anomalies
@@ -1,12 +1,80 @@
 """
 Google Search validator for cross-referencing generated data.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+import html
+import threading
 import time
 from loguru import logger
 from googlesearch import search
 from src.config.settings import settings
 
+# Minimum gap in seconds between the starts of two searches (be respectful to
+# the search API); searches may still overlap while they run
+SEARCH_INTERVAL = 1.0
+
+
+@lru_cache(maxsize=64)
+def _validation_queries(domain: str, dataset_type: str) -> Tuple[str, ...]:
+    """Search queries for a domain/dataset pair (immutable, so safe to cache)."""
+    queries = []
+    
+    if domain == "Capital Markets":
+        if "Stock" in dataset_type:
+            queries = [
+                "typical stock price ranges NYSE NASDAQ",
+                "average daily trading volume stocks",
+                "stock market volatility patterns"
+            ]
+        elif "Securities" in dataset_type:
+            queries = [
+                "ISIN format securities identification",
+                "market capitalization distribution stocks",
+                "stock exchange listing requirements"
+            ]
+    
+    elif domain == "Private Equity":
+        queries = [
+            "private equity fund size typical range",
+            "PE deal IRR benchmarks industry",
+            "private equity management fees structure"
+        ]
+    
+    elif domain == "Venture Capital":
+        queries = [
+            "venture capital funding round sizes",
+            "startup valuation benchmarks by stage",
+            "VC equity stake typical percentage"
+        ]
+    
+    elif domain == "Banking":
+        if "Customer" in dataset_type:
+            queries = [
+                "bank customer segmentation criteria",
+                "KYC requirements banking industry"
+            ]
+        elif "CASA" in dataset_type:
+            queries = [
+                "savings account interest rates typical",
+                "average bank account balance statistics"
+            ]
+        elif "Loan" in dataset_type:
+            queries = [
+                "personal loan interest rates range",
+                "mortgage loan to value ratio typical",
+                "credit score requirements loans"
+            ]
+    
+    # Fallback generic query
+    if not queries:
+        queries = [f"{domain} {dataset_type} typical data ranges"]
+    
+    return tuple(queries)
+
 
 class SearchValidator:
     """Validate generated data using Google Search."""
@@ -14,24 +82,74 @@ class SearchValidator:
     def __init__(self):
         """Initialize search validator."""
         self.rate_limit = settings.search_requests_per_day
-        self.request_count = 0
-        self.last_reset = time.time()
+        # Daily quota as a token bucket that refills continuously at
+        # rate_limit tokens per 24 hours (monotonic clock)
+        self._tokens = float(self.rate_limit)
+        self._last_refill = time.monotonic()
+        self.cache_ttl = settings.search_cache_ttl
+        # (domain, dataset_type) -> (timestamp, sources)
+        self._validation_cache: Dict[Tuple[str, str], Tuple[float, List[Dict[str, str]]]] = {}
+        # Timestamps of recent search calls, for the per-minute load check
+        self._recent_searches = deque(maxlen=100)
+        # Guards the token bucket and the search start schedule across threads
+        self._lock = threading.Lock()
+        self._next_search_at = 0.0
         logger.info("SearchValidator initialized")
     
-    def _rate_limit_check(self):
-        """Check and enforce rate limiting."""
-        current_time = time.time()
+    def _refill(self) -> float:
+        """Top up the token bucket for the time elapsed (call with _lock held)."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.rate_limit,
+            self._tokens + (now - self._last_refill) * self.rate_limit / 86400
+        )
+        self._last_refill = now
+        return self._tokens
+    
+    def _available_tokens(self) -> float:
+        """Current token balance (a read-only probe: nothing spent or logged)."""
+        with self._lock:
+            return self._refill()
+    
+    def _rate_limit_check(self, num_results: int = 1) -> int:
+        """
+        Check and enforce rate limiting.
         
-        # Reset counter every 24 hours
-        if current_time - self.last_reset > 86400:
-            self.request_count = 0
-            self.last_reset = current_time
+        The balance check and the spend happen in one locked step, so
+        concurrent searches cannot all pass the check before any of them
+        spends.
+        
+        Args:
+            num_results: Results the search will request (one token each)
         
-        if self.request_count >= self.rate_limit:
+        Returns:
+            Tokens reserved: at most num_results, 0 once the quota is spent
+        """
+        with self._lock:
+            reserved = min(num_results, int(self._refill()))
+            self._tokens -= reserved
+        
+        if reserved < 1:
             logger.warning("Search rate limit reached")
-            return False
         
-        return True
+        return reserved
+    
+    def _refund(self, tokens: int):
+        """Return reserved tokens that a search did not use."""
+        if tokens > 0:
+            with self._lock:
+                self._tokens = min(self.rate_limit, self._tokens + tokens)
+    
+    def _wait_for_search_slot(self):
+        """Space search starts SEARCH_INTERVAL apart (safe to call from several threads)."""
+        # Reserve the slot under the lock but sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            slot_time = max(now, self._next_search_at)
+            self._next_search_at = slot_time + SEARCH_INTERVAL
+        
+        if slot_time > now:
+            time.sleep(slot_time - now)
     
     def search_web(
         self,
@@ -48,20 +166,24 @@ class SearchValidator:
         Returns:
             List of search results with titles and URLs
         """
-        if not self._rate_limit_check():
+        # Never request more results than the tokens reserved for them
+        num_results = self._rate_limit_check(num_results)
+        if num_results < 1:
             logger.warning("Skipping search due to rate limit")
             return []
         
+        self._wait_for_search_slot()
+        self._recent_searches.append(time.time())
+        results = []
+        
         try:
             logger.info(f"Searching: {query}")
-            results = []
             
-            for url in search(query, num_results=num_results, sleep_interval=2):
+            for url in islice(search(query, num_results=num_results, sleep_interval=2), num_results):
                 results.append({
                     'url': url,
                     'query': query
                 })
-                self.request_count += 1
             
             logger.info(f"Found {len(results)} results")
             return results
@@ -69,6 +191,9 @@ class SearchValidator:
         except Exception as e:
             logger.error(f"Search error: {str(e)}")
             return []
+        
+        finally:
+            self._refund(num_results - len(results))
     
     def validate_domain_patterns(
         self,
@@ -85,16 +210,75 @@ class SearchValidator:
         Returns:
             List of validation sources
         """
+        # Results for a domain/dataset pair change slowly, so repeat requests
+        # within the TTL are answered without touching the search API
+        cache_key = self._cache_key(domain, dataset_type)
+        cached = self._validation_cache.get(cache_key)
+        if cached and time.time() - cached[0] < self.cache_ttl:
+            logger.info(f"Using cached validation sources for {domain} - {dataset_type}")
+            return list(cached[1])
+        
         queries = self._get_validation_queries(domain, dataset_type)
         all_sources = []
         
-        for query in queries:
-            results = self.search_web(query, num_results=3)
-            all_sources.extend(results)
-            time.sleep(1)  # Be respectful to search API
+        # Searches are I/O bound: run them side by side (starts stay spaced by
+        # _wait_for_search_slot) and keep the results in query order
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            for results in executor.map(lambda query: self.search_web(query, num_results=3), queries):
+                all_sources.extend(results)
+        
+        # Empty results usually mean rate limiting or an API error; retry those next time
+        if all_sources:
+            self._validation_cache[cache_key] = (time.time(), all_sources)
         
         return all_sources
     
+    def clear_validation_cache(self):
+        """Drop all cached validation sources."""
+        self._validation_cache.clear()
+    
+    def _cache_key(self, domain: str, dataset_type: str) -> Tuple[str, str]:
+        """Normalized validation cache key."""
+        return (domain.strip().lower(), dataset_type.strip().lower())
+    
+    def get_last_sources(
+        self,
+        domain: str,
+        dataset_type: str
+    ) -> List[Dict[str, str]]:
+        """
+        Last known validation sources, even if older than the cache TTL.
+        
+        Args:
+            domain: Financial domain
+            dataset_type: Type of dataset
+        
+        Returns:
+            List of validation sources (empty if never validated)
+        """
+        cached = self._validation_cache.get(self._cache_key(domain, dataset_type))
+        return list(cached[1]) if cached else []
+    
+    def is_under_load(self) -> bool:
+        """
+        Check whether new searches should be avoided.
+        
+        Returns:
+            True when the daily quota is spent or the last minute already
+            saw more than settings.search_burst_limit searches
+        """
+        if self._available_tokens() < 1:
+            logger.info("Search quota spent; deferring validation until it refills")
+            return True
+        
+        now = time.time()
+        recent = sum(1 for t in self._recent_searches if now - t < 60)
+        if recent > settings.search_burst_limit:
+            logger.info(f"{recent} searches in the last minute; deferring validation")
+            return True
+        
+        return False
+    
     def _get_validation_queries(
         self,
         domain: str,
@@ -110,59 +294,7 @@ class SearchValidator:
         Returns:
             List of search queries
         """
-        queries = []
-        
-        if domain == "Capital Markets":
-            if "Stock" in dataset_type:
-                queries = [
-                    "typical stock price ranges NYSE NASDAQ",
-                    "average daily trading volume stocks",
-                    "stock market volatility patterns"
-                ]
-            elif "Securities" in dataset_type:
-                queries = [
-                    "ISIN format securities identification",
-                    "market capitalization distribution stocks",
-                    "stock exchange listing requirements"
-                ]
-        
-        elif domain == "Private Equity":
-            queries = [
-                "private equity fund size typical range",
-                "PE deal IRR benchmarks industry",
-                "private equity management fees structure"
-            ]
-        
-        elif domain == "Venture Capital":
-            queries = [
-                "venture capital funding round sizes",
-                "startup valuation benchmarks by stage",
-                "VC equity stake typical percentage"
-            ]
-        
-        elif domain == "Banking":
-            if "Customer" in dataset_type:
-                queries = [
-                    "bank customer segmentation criteria",
-                    "KYC requirements banking industry"
-                ]
-            elif "CASA" in dataset_type:
-                queries = [
-                    "savings account interest rates typical",
-                    "average bank account balance statistics"
-                ]
-            elif "Loan" in dataset_type:
-                queries = [
-                    "personal loan interest rates range",
-                    "mortgage loan to value ratio typical",
-                    "credit score requirements loans"
-                ]
-        
-        # Fallback generic query
-        if not queries:
-            queries = [f"{domain} {dataset_type} typical data ranges"]
-        
-        return queries
+        return list(_validation_queries(domain, dataset_type))
     
     def validate_field_ranges(
         self,
@@ -204,23 +336,27 @@ class SearchValidator:
         if not sources:
             return "<p>No validation sources found.</p>"
         
-        html = "<div style='padding: 10px;'>"
-        html += "<h3>🔍 Validation Sources</h3>"
-        html += "<p>Data patterns were cross-referenced with the following sources:</p>"
-        html += "<ol>"
+        # Collect fragments and join once rather than growing a string
+        parts = [
+            "<div style='padding: 10px;'>",
+            "<h3>🔍 Validation Sources</h3>",
+            "<p>Data patterns were cross-referenced with the following sources:</p>",
+            "<ol>"
+        ]
         
         for source in sources:
-            url = source.get('url', '')
-            query = source.get('query', 'Unknown query')
-            html += f"<li>"
-            html += f"<strong>Query:</strong> {query}<br>"
-            html += f"<a href='{url}' target='_blank'>{url}</a>"
-            html += f"</li>"
+            # Search results are untrusted text; escape them before embedding
+            url = html.escape(source.get('url', ''))
+            query = html.escape(source.get('query', 'Unknown query'))
+            parts.append("<li>")
+            parts.append(f"<strong>Query:</strong> {query}<br>")
+            parts.append(f"<a href='{url}' target='_blank'>{url}</a>")
+            parts.append("</li>")
         
-        html += "</ol>"
-        html += "</div>"
+        parts.append("</ol>")
+        parts.append("</div>")
         
-        return html
+        return "".join(parts)
     
     def get_regulatory_info(
         self,
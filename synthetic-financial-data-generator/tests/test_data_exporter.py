@@ -0,0 +1,50 @@
+"""
+Unit tests for data export.
+"""
+import pytest
+import pandas as pd
+from src.utils.data_exporter import DataExporter
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    """Exporter writing to a temporary directory."""
+    return DataExporter(tmp_path)
+
+
+@pytest.fixture
+def mixed_df():
+    """Small frame with one column of each dtype the generators produce."""
+    return pd.DataFrame({
+        "ticker": ["AAPL", "A,B"],
+        "price": [150.0, 1.25],
+        "volume": [10, 20],
+        "active": [True, False],
+        "date": pd.to_datetime(["2024-01-31", "2024-02-01"]),
+        "ts": pd.to_datetime(["2024-01-01 10:00:00.5", "2024-01-01"], format="ISO8601"),
+        "sector": pd.Categorical(["Tech", "Tech"])
+    })
+
+
+class TestCsvExport:
+    """Test CSV export."""
+    
+    def test_to_csv_text(self, exporter, mixed_df):
+        """Test the exact CSV text written by the Arrow writer."""
+        filepath = exporter.to_csv(mixed_df, "mixed")
+        
+        assert filepath.read_text(encoding="utf-8") == (
+            '"ticker","price","volume","active","date","ts","sector"\n'
+            '"AAPL",150,10,true,2024-01-31,2024-01-01 10:00:00.500,"Tech"\n'
+            '"A,B",1.25,20,false,2024-02-01,2024-01-01 00:00:00.000,"Tech"\n'
+        )
+    
+    def test_to_csv_with_index_uses_pandas(self, exporter, mixed_df):
+        """Test index exports keep pandas' CSV formatting."""
+        filepath = exporter.to_csv(mixed_df, "mixed", index=True)
+        
+        assert filepath.read_text(encoding="utf-8") == mixed_df.to_csv()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,199 @@
+"""
+Unit tests for the data quality validator.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from src.validators.data_validator import DataValidator
+
+
+@pytest.fixture
+def validator():
+    """Data validator with the default thresholds."""
+    return DataValidator()
+
+
+@pytest.fixture
+def loans_df():
+    """Clean loan-style frame covering the id, amount and date name roles."""
+    return pd.DataFrame({
+        "loan_id": ["L1", "L2", "L3", "L4"],
+        "account_number": [101, 102, 103, 104],
+        "loan_amount": [1000.0, 2500.0, 1800.0, 3200.0],
+        "status": ["open", "closed", "open", "open"],
+        "start_date": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01"])
+    })
+
+
+class TestCompleteness:
+    """Test the completeness check."""
+    
+    def test_complete(self, validator, loans_df):
+        """Test a frame without nulls passes with a full score."""
+        result = validator.check_completeness(loans_df)
+        
+        assert result['passed']
+        assert result['score'] == 1.0
+        assert result['issues'] == []
+    
+    def test_sparse_columns(self, validator, loans_df):
+        """Test float and object nulls are counted and reported per column."""
+        loans_df.loc[:1, "loan_amount"] = np.nan
+        loans_df.loc[0, "status"] = None
+        
+        result = validator.check_completeness(loans_df)
+        
+        assert not result['passed']
+        assert result['score'] == pytest.approx(17 / 20)
+        assert result['issues'] == [
+            "Column 'loan_amount' has 50.0% null values",
+            "Column 'status' has 25.0% null values"
+        ]
+
+
+class TestAnomalies:
+    """Test IQR outlier detection."""
+    
+    def test_outliers(self, validator):
+        """Test values beyond 3 IQRs are counted per numeric column."""
+        df = pd.DataFrame({
+            "price": [10.0, 11.0, 12.0, 13.0, 14.0, 1000.0],
+            "volume": [1, 2, 3, 4, 5, 6],
+            "ticker": list("ABCDEF")
+        })
+        
+        anomalies = validator.find_anomalies(df)
+        
+        assert anomalies == [{
+            'column': 'price',
+            'type': 'outliers',
+            'count': 1,
+            'percentage': pytest.approx(100 / 6)
+        }]
+    
+    def test_no_numeric_columns(self, validator):
+        """Test frames without numeric columns have no anomalies."""
+        assert validator.find_anomalies(pd.DataFrame({"ticker": ["A", "B"]})) == []
+
+
+class TestUniqueness:
+    """Test the uniqueness check on ID columns."""
+    
+    def test_unique_ids(self, validator, loans_df):
+        """Test unique ID columns pass."""
+        result = validator.check_uniqueness(loans_df)
+        
+        assert result['passed']
+        assert result['issues'] == []
+    
+    def test_duplicate_ids(self, validator, loans_df):
+        """Test ID columns below the uniqueness threshold fail."""
+        loans_df["loan_id"] = ["L1", "L1", "L2", "L2"]
+        
+        result = validator.check_uniqueness(loans_df)
+        
+        assert not result['passed']
+        assert result['issues'] == [
+            "Column 'loan_id' has only 50.0% unique values (expected 90%)"
+        ]
+    
+    def test_null_ids(self, validator, loans_df):
+        """Test nulls do not count as distinct ID values."""
+        loans_df["loan_id"] = ["L1", "L2", "L3", None]
+        
+        result = validator.check_uniqueness(loans_df)
+        
+        assert not result['passed']
+        assert "75.0%" in result['issues'][0]
+    
+    def test_arrow_backed_ids(self, validator, loans_df):
+        """Test Arrow-backed ID columns are counted like NumPy ones."""
+        loans_df["loan_id"] = pd.Series(["L1", "L1", "L2", None], dtype="string[pyarrow]")
+        
+        assert validator._count_distinct(loans_df["loan_id"]) == 2
+        
+        loans_df["loan_id"] = pd.Series(["L1", "L1", "L2", None], dtype=pd.ArrowDtype(pa.string()))
+        
+        assert validator._count_distinct(loans_df["loan_id"]) == 2
+        assert not validator.check_uniqueness(loans_df)['passed']
+
+
+class TestDataTypes:
+    """Test the expected dtype check."""
+    
+    def test_expected_types(self, validator, loans_df):
+        """Test numeric and datetime columns pass."""
+        assert validator.check_data_types(loans_df)['passed']
+    
+    def test_wrong_types(self, validator, loans_df):
+        """Test text amounts and dates are reported."""
+        loans_df["loan_amount"] = loans_df["loan_amount"].astype(str)
+        loans_df["start_date"] = loans_df["start_date"].dt.strftime("%Y-%m-%d")
+        
+        result = validator.check_data_types(loans_df)
+        
+        assert not result['passed']
+        assert result['issues'] == [
+            "Column 'loan_amount' should be numeric but is object",
+            "Column 'start_date' should be datetime but is object"
+        ]
+    
+    def test_boolean_counts_as_numeric(self, validator):
+        """Test boolean columns satisfy a numeric name."""
+        df = pd.DataFrame({"value_flag": [True, False]})
+        
+        assert validator.check_data_types(df)['passed']
+
+
+class TestValidate:
+    """Test the combined validation report."""
+    
+    def test_clean_frame(self, validator, loans_df):
+        """Test a clean frame passes every check."""
+        results = validator.validate(loans_df)
+        
+        assert results['passed']
+        assert results['summary'] == {'total_checks': 3, 'passed_checks': 3, 'total_issues': 0}
+    
+    def test_empty_frame(self, validator):
+        """Test an empty frame fails without running the checks."""
+        results = validator.validate(pd.DataFrame({"loan_id": []}))
+        
+        assert not results['passed']
+        assert results['checks'] == []
+        assert results['issues'] == ["Dataset is empty"]
+        assert results['summary'] == {'total_checks': 0, 'passed_checks': 0, 'total_issues': 1}
+
+
+class TestClassifyColumns:
+    """Test column roles derived from names."""
+    
+    def test_roles(self, validator, loans_df):
+        """Test id, numeric and date roles keep column order."""
+        assert validator._classify_columns(loans_df) == {
+            'id': ['loan_id', 'account_number'],
+            'numeric_expected': ['loan_amount'],
+            'date_expected': ['start_date']
+        }
+    
+    def test_non_string_names(self, validator):
+        """Test integer column labels are matched as text."""
+        df = pd.DataFrame([[1, 2]])
+        
+        assert validator._classify_columns(df) == {
+            'id': [],
+            'numeric_expected': [],
+            'date_expected': []
+        }
+    
+    def test_schema_cache(self, validator, loans_df):
+        """Test repeat validations reuse one classification per schema."""
+        validator.validate(loans_df)
+        validator.validate(loans_df.copy())
+        
+        assert list(validator._schema_cache) == [tuple(loans_df.columns)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
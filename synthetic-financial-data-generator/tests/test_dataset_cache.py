@@ -0,0 +1,100 @@
+"""
+Unit tests for the on-disk dataset cache.
+"""
+import pytest
+import pandas as pd
+import src.utils.dataset_cache as dataset_cache
+from src.config.settings import settings
+from src.utils.dataset_cache import DatasetCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache writing to a temporary directory."""
+    return DatasetCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def stock_df():
+    """Generated-style frame with category and datetime columns."""
+    return pd.DataFrame({
+        "ticker": ["AAPL", "MSFT", "AAPL"],
+        "date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+        "close": [154.0, 370.5, 155.25],
+        "volume": [1000000, 2500000, 1200000],
+        "sector": pd.Categorical(["Tech", "Tech", "Tech"])
+    }, index=[5, 6, 7])
+
+
+PROMPT = "Generate {num_records} stock price records between {start_date} and {end_date}"
+REQUEST = ("Capital Markets", "Stock Prices", PROMPT, 3, "2024-01-01", "2024-01-03")
+
+
+class TestDatasetCache:
+    """Test dataset cache round trips and keys."""
+    
+    def test_round_trip(self, cache, stock_df):
+        """Test a stored dataset comes back unchanged, dtypes included."""
+        assert cache.get(*REQUEST) is None
+        
+        cache.put(stock_df, *REQUEST)
+        cached = cache.get(*REQUEST)
+        
+        assert cached is not None
+        pd.testing.assert_frame_equal(cached, stock_df.reset_index(drop=True))
+        assert isinstance(cached["sector"].dtype, pd.CategoricalDtype)
+        assert cached["date"].dtype == "datetime64[ns]"
+    
+    def test_num_records_miss(self, cache, stock_df):
+        """Test a different record count misses the cache."""
+        cache.put(stock_df, *REQUEST)
+        
+        domain, dataset_type, prompt, _, start_date, end_date = REQUEST
+        assert cache.get(domain, dataset_type, prompt, 4, start_date, end_date) is None
+    
+    def test_prompt_miss(self, cache, stock_df):
+        """Test an edited prompt template misses the cache."""
+        cache.put(stock_df, *REQUEST)
+        
+        domain, dataset_type, prompt, num_records, start_date, end_date = REQUEST
+        edited = prompt + " (adj_close required)"
+        assert cache.get(domain, dataset_type, edited, num_records, start_date, end_date) is None
+    
+    def test_model_miss(self, cache, stock_df, monkeypatch):
+        """Test a different Gemini model misses the cache."""
+        cache.put(stock_df, *REQUEST)
+        
+        monkeypatch.setattr(settings, "gemini_model", settings.gemini_model + "-other")
+        assert cache.get(*REQUEST) is None
+    
+    def test_version_miss(self, cache, stock_df, monkeypatch):
+        """Test a new cache format version misses the cache."""
+        cache.put(stock_df, *REQUEST)
+        
+        monkeypatch.setattr(dataset_cache, "CACHE_FORMAT_VERSION", dataset_cache.CACHE_FORMAT_VERSION + 1)
+        assert cache.get(*REQUEST) is None
+    
+    def test_put_leaves_no_temp_files(self, cache, stock_df):
+        """Test a write lands under the final name only."""
+        cache.put(stock_df, *REQUEST)
+        
+        assert [path.suffix for path in cache.cache_dir.iterdir()] == [".feather"]
+    
+    def test_failed_put_keeps_existing_file(self, cache, stock_df):
+        """Test a failed write leaves the previously cached dataset intact."""
+        cache.put(stock_df, *REQUEST)
+        cache.put(pd.DataFrame({"mixed": [1, "a"]}), *REQUEST)
+        
+        pd.testing.assert_frame_equal(cache.get(*REQUEST), stock_df.reset_index(drop=True))
+        assert len(list(cache.cache_dir.iterdir())) == 1
+    
+    def test_clear(self, cache, stock_df):
+        """Test clear removes stored datasets."""
+        cache.put(stock_df, *REQUEST)
+        cache.clear()
+        
+        assert cache.get(*REQUEST) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
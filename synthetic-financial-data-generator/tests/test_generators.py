@@ -6,6 +6,8 @@ import pandas as pd
 from unittest.mock import Mock, MagicMock
 from src.generators.capital_markets import CapitalMarketsGenerator
 from src.generators.banking import BankingGenerator
+from src.config.prompts import CAPITAL_MARKETS_PROMPTS
+from src.generators.base_generator import batch_listener
 from src.llm.gemini_client import GeminiClient
 
 
@@ -68,6 +70,14 @@ class TestCapitalMarketsGenerator:
         assert isinstance(df, pd.DataFrame)
         assert 'ticker' in df.columns
         assert 'isin' in df.columns
+    
+    def test_prompt_template(self, mock_llm_client):
+        """Test dataset types resolve to their prompt template."""
+        generator = CapitalMarketsGenerator(mock_llm_client)
+        
+        assert generator.prompt_template("Stock Prices (OHLCV)") == CAPITAL_MARKETS_PROMPTS["stock_prices"]
+        with pytest.raises(ValueError):
+            generator.prompt_template("Unknown Dataset")
 
 
 class TestBankingGenerator:
@@ -117,6 +127,40 @@ class TestBaseGenerator:
         validated = generator._validate_records(records)
         assert len(validated) == 3  # All records have ticker
     
+    def test_generate_in_batches(self, mock_llm_client):
+        """Test concurrent batches are sized correctly and kept in order."""
+        mock_llm_client.generate_json.side_effect = lambda prompt: [{"batch_size": prompt}]
+        generator = CapitalMarketsGenerator(mock_llm_client)
+        
+        records = generator._generate_in_batches("{num_records}", total_records=250, batch_size=100)
+        
+        assert [r["batch_size"] for r in records] == ["100", "100", "50"]
+    
+    def test_generate_many(self, mock_llm_client):
+        """Test several datasets are generated in one call."""
+        generator = CapitalMarketsGenerator(mock_llm_client)
+        
+        results = generator.generate_many([
+            ("Stock Prices (OHLCV)", 5),
+            ("Trading Volumes", 5)
+        ])
+        
+        assert list(results) == ["Stock Prices (OHLCV)", "Trading Volumes"]
+        assert all(not df.empty for df in results.values())
+    
+    def test_batch_listener(self, mock_llm_client):
+        """Test the batch listener is notified once per finished batch."""
+        generator = CapitalMarketsGenerator(mock_llm_client)
+        updates = []
+        
+        token = batch_listener.set(lambda done, total, records: updates.append((done, total, len(records))))
+        try:
+            generator._generate_in_batches("{num_records}", total_records=30, batch_size=10)
+        finally:
+            batch_listener.reset(token)
+        
+        assert updates == [(1, 3, 1), (2, 3, 1), (3, 3, 1)]
+    
     def test_to_dataframe(self, mock_llm_client):
         """Test DataFrame conversion."""
         generator = CapitalMarketsGenerator(mock_llm_client)
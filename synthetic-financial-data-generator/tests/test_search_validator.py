@@ -0,0 +1,133 @@
+"""
+Unit tests for the search validator's quota and load checks.
+"""
+import time
+import pytest
+import src.validators.search_validator as search_validator
+from src.config.settings import settings
+from src.validators.search_validator import SearchValidator
+
+
+@pytest.fixture
+def validator(monkeypatch):
+    """Validator with a stubbed search API and no spacing between searches."""
+    def fake_search(query, num_results, sleep_interval):
+        return (f"https://example.com/{query}/{i}" for i in range(num_results))
+    
+    monkeypatch.setattr(search_validator, "search", fake_search)
+    monkeypatch.setattr(search_validator, "SEARCH_INTERVAL", 0)
+    return SearchValidator()
+
+
+class TestTokenBucket:
+    """Test the daily search quota."""
+    
+    def test_results_spend_tokens(self, validator):
+        """Test each search result takes one token."""
+        results = validator.search_web("stock prices", num_results=3)
+        
+        assert len(results) == 3
+        assert validator._tokens == pytest.approx(validator.rate_limit - 3, abs=0.01)
+    
+    def test_empty_bucket_skips_search(self, validator):
+        """Test searches are skipped once the quota is spent."""
+        validator._tokens = 0.5
+        
+        assert validator._rate_limit_check() == 0
+        assert validator.search_web("stock prices") == []
+    
+    def test_search_capped_at_balance(self, validator):
+        """Test a search never requests more results than tokens left."""
+        validator._tokens = 2.5
+        
+        assert len(validator.search_web("stock prices", num_results=5)) == 2
+        assert validator._tokens == pytest.approx(0.5, abs=0.01)
+    
+    def test_concurrent_searches_near_empty(self, validator, monkeypatch):
+        """Test concurrent validation searches cannot overspend the quota."""
+        def slow_search(query, num_results, sleep_interval):
+            for i in range(num_results):
+                time.sleep(0.01)
+                yield f"https://example.com/{query}/{i}"
+        
+        monkeypatch.setattr(search_validator, "search", slow_search)
+        validator._tokens = 1.5
+        
+        sources = validator.validate_domain_patterns("Private Equity", "Fund Performance")
+        
+        assert len(sources) == 1
+        assert validator._tokens == pytest.approx(0.5, abs=0.01)
+    
+    def test_unused_tokens_refunded(self, validator, monkeypatch):
+        """Test tokens for results that never came back are returned."""
+        def short_search(query, num_results, sleep_interval):
+            return iter(["https://example.com/only"])
+        
+        monkeypatch.setattr(search_validator, "search", short_search)
+        
+        assert len(validator.search_web("stock prices", num_results=3)) == 1
+        assert validator._tokens == pytest.approx(validator.rate_limit - 1, abs=0.01)
+    
+    def test_failed_search_refunded(self, validator, monkeypatch):
+        """Test a search error gives back the tokens it did not use."""
+        def failing_search(query, num_results, sleep_interval):
+            raise RuntimeError("blocked")
+        
+        monkeypatch.setattr(search_validator, "search", failing_search)
+        
+        assert validator.search_web("stock prices", num_results=3) == []
+        assert validator._tokens == pytest.approx(validator.rate_limit, abs=0.01)
+    
+    def test_refill(self, validator):
+        """Test tokens refill at rate_limit per day, capped at rate_limit."""
+        validator._tokens = 0.0
+        validator._last_refill -= 86400 / validator.rate_limit
+        
+        assert validator._available_tokens() == pytest.approx(1.0, abs=0.01)
+        
+        validator._last_refill -= 2 * 86400
+        assert validator._available_tokens() == validator.rate_limit
+
+class TestUnderLoad:
+    """Test the load check used to defer validation."""
+    
+    def test_fresh_validator(self, validator):
+        """Test a full quota with no recent searches is not under load."""
+        assert validator.is_under_load() is False
+    
+    def test_spent_quota(self, validator):
+        """Test an empty token bucket counts as load."""
+        validator._tokens = 0.5
+        
+        assert validator.is_under_load() is True
+    
+    def test_low_quota(self, validator):
+        """Test a low but usable balance does not defer validation."""
+        validator._tokens = 2.0
+        
+        assert validator.is_under_load() is False
+    
+    def test_probe_spends_nothing(self, validator):
+        """Test the load check leaves the balance untouched."""
+        validator._tokens = 2.0
+        validator.is_under_load()
+        
+        assert validator._tokens == pytest.approx(2.0, abs=0.01)
+    
+    def test_burst(self, validator):
+        """Test more than search_burst_limit searches in a minute counts as load."""
+        now = time.time()
+        validator._recent_searches.extend([now] * (settings.search_burst_limit + 1))
+        
+        assert validator.is_under_load() is True
+    
+    def test_old_searches_ignored(self, validator):
+        """Test searches older than a minute do not count toward the burst."""
+        old = time.time() - 120
+        validator._recent_searches.extend([old] * (settings.search_burst_limit + 1))
+        
+        assert validator.is_under_load() is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])